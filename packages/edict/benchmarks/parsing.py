@@ -0,0 +1,303 @@
+# /// script
+# requires-python = ">=3.13"
+# dependencies = [
+#     "edict",
+# ]
+# ///
+"""
+Measure edict's parsing throughput and peak memory on a synthetic dataset the size of the full JMdict.
+
+Each stage is timed on its own, over inputs prepared beforehand:
+- load: streaming the raw entries out of a jmdict.json file
+- word: `Word.from_json` on every entry
+- word_trusted: the same without validation (`validate=False`)
+- kanji, reading, sense, gloss, example: the nested `from_json` on every item of that kind
+- enum: constructing every tag enum value (part of speech, field, dialect, misc, gloss type)
+
+Stage outputs are kept until the stage ends, so peak memory includes the parsed result.
+Peak memory is measured in a second, traced pass so tracing does not skew the timings.
+
+    uv run benchmarks/parsing.py
+    uv run benchmarks/parsing.py --entries 20000 --no-store
+
+Every run is appended to `benchmarks/results/parsing.jsonl` with the edict version and commit,
+and compared against the previous stored run with the same dataset, so parser regressions show up
+across versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from functools import partial
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from edict.core.jmdict import JMDICT_WORDS_KEY, iter_word_entries
+from edict.schemas.jmdict import Gloss, Kanji, Reading, Sense, SenseExample, Word
+from edict.types.jmdict import Dialect, GlossType, MiscInformation, PartOfSpeech, SubjectField
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+RESULTS_FILE_PATH = Path(__file__).parent / "results" / "parsing.jsonl"
+
+# Roughly the number of entries in the full JMdict (English) release
+DEFAULT_ENTRY_COUNT = 215_000
+
+# Item counts per parent, drawn uniformly from these choices: changing them makes results
+# incomparable with earlier runs
+KANJI_COUNTS = (0, 1, 1, 1, 1, 2, 2, 3)
+READING_COUNTS = (1, 1, 1, 1, 2, 2, 3)
+SENSE_COUNTS = (1, 1, 1, 2, 2, 3, 4)
+GLOSS_COUNTS = (1, 1, 2, 2, 3, 4, 5)
+TAG_COUNTS = (0, 0, 0, 1, 1, 2)
+EXAMPLE_RATE = 0.15
+DIALECT_RATE = 0.02
+GLOSS_TYPE_RATE = 0.05
+COMMON_RATE = 0.1
+
+HIRAGANA = [chr(code) for code in range(ord("ぁ"), ord("ゖ") + 1)]
+KANJI = [chr(code) for code in range(0x4E00, 0x4E00 + 3000)]
+LATIN_WORDS = ("to", "eat", "the", "of", "person", "water", "go", "big", "small", "thing", "place", "time")
+
+ENUM_VALUES: dict[type, list[str]] = {
+    enum: [member.value for member in enum]
+    for enum in (PartOfSpeech, SubjectField, Dialect, MiscInformation, GlossType)
+}
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    inputs: list[Any]
+    func: Callable[[Any], Any]
+
+
+@dataclass
+class StageResult:
+    items: int
+    seconds: float
+    items_per_second: float
+    peak_memory_mib: float
+
+
+def _text(rng: random.Random, alphabet: list[str], low: int, high: int) -> str:
+    return "".join(rng.choices(alphabet, k=rng.randint(low, high)))
+
+
+def _tags(rng: random.Random, values: list[str]) -> list[str]:
+    return rng.sample(values, rng.choice(TAG_COUNTS))
+
+
+def _gloss(rng: random.Random, gloss_types: list[str]) -> dict:
+    return {
+        "lang": "eng",
+        "gender": None,
+        "type": rng.choice(gloss_types) if rng.random() < GLOSS_TYPE_RATE else None,
+        "text": " ".join(rng.choices(LATIN_WORDS, k=rng.randint(1, 4))),
+    }
+
+
+def _example(rng: random.Random, text: str) -> dict:
+    return {
+        "source": {"type": "tatoeba", "value": str(rng.randint(1, 250_000))},
+        "text": text,
+        "sentences": [
+            {"land": "jpn", "text": _text(rng, HIRAGANA, 8, 24) + "。"},
+            {"land": "eng", "text": " ".join(rng.choices(LATIN_WORDS, k=rng.randint(4, 12))) + "."},
+        ],
+    }
+
+
+def synthetic_entry(rng: random.Random, word_id: int) -> dict:
+    """One JMdict-shaped entry (jmdict-simplified JSON) with randomized forms, tags and glosses."""
+    kanji = [
+        {"common": rng.random() < COMMON_RATE, "text": _text(rng, KANJI, 1, 4), "tags": []}
+        for _ in range(rng.choice(KANJI_COUNTS))
+    ]
+    kana = [
+        {"common": rng.random() < COMMON_RATE, "text": _text(rng, HIRAGANA, 2, 7), "tags": [], "appliesToKanji": ["*"]}
+        for _ in range(rng.choice(READING_COUNTS))
+    ]
+    senses = [
+        {
+            "partOfSpeech": rng.sample(ENUM_VALUES[PartOfSpeech], rng.randint(1, 2)),
+            "appliesToKanji": ["*"],
+            "appliesToKana": ["*"],
+            "related": [],
+            "antonym": [],
+            "field": _tags(rng, ENUM_VALUES[SubjectField]),
+            "dialect": [rng.choice(ENUM_VALUES[Dialect])] if rng.random() < DIALECT_RATE else [],
+            "misc": _tags(rng, ENUM_VALUES[MiscInformation]),
+            "info": [],
+            "languageSource": [],
+            "gloss": [_gloss(rng, ENUM_VALUES[GlossType]) for _ in range(rng.choice(GLOSS_COUNTS))],
+            "examples": [_example(rng, kana[0]["text"])] if rng.random() < EXAMPLE_RATE else [],
+        }
+        for _ in range(rng.choice(SENSE_COUNTS))
+    ]
+    return {"id": str(word_id), "kanji": kanji, "kana": kana, "sense": senses}
+
+
+def write_dataset(path: Path, count: int, seed: int) -> list[dict]:
+    """Write a jmdict.json with `count` synthetic entries and return the entries."""
+    rng = random.Random(seed)  # noqa: S311
+    entries = [synthetic_entry(rng, 1_000_000 + position) for position in range(count)]
+    document = {"version": "synthetic", "languages": ["eng"], "tags": {}, JMDICT_WORDS_KEY: entries}
+    path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+    return entries
+
+
+def build_stages(path: Path, entries: list[dict]) -> list[Stage]:
+    senses = [sense for entry in entries for sense in entry["sense"]]
+    enum_values = [
+        (enum, value)
+        for sense in senses
+        for enum, key in (
+            (PartOfSpeech, "partOfSpeech"),
+            (SubjectField, "field"),
+            (Dialect, "dialect"),
+            (MiscInformation, "misc"),
+        )
+        for value in sense[key]
+    ] + [(GlossType, gloss["type"]) for sense in senses for gloss in sense["gloss"] if gloss["type"]]
+
+    return [
+        Stage("load", [path], lambda file_path: list(iter_word_entries(file_path))),
+        Stage("word", entries, Word.from_json),
+        Stage("word_trusted", entries, partial(Word.from_json, validate=False)),
+        Stage("kanji", [kanji for entry in entries for kanji in entry["kanji"]], Kanji.from_json),
+        Stage("reading", [kana for entry in entries for kana in entry["kana"]], Reading.from_json),
+        Stage("sense", senses, Sense.from_json),
+        Stage("gloss", [gloss for sense in senses for gloss in sense["gloss"]], Gloss.from_json),
+        Stage("example", [example for sense in senses for example in sense["examples"]], SenseExample.from_json),
+        Stage("enum", enum_values, lambda pair: pair[0](pair[1])),
+    ]
+
+
+def run_stage(stage: Stage, item_count: int) -> StageResult:
+    """
+    Time `stage.func` over all inputs, then repeat under tracemalloc for the peak memory.
+    `item_count` is what the rate is reported against (entries for `load`, inputs otherwise).
+    """
+    gc.collect()
+    started = time.perf_counter()
+    outputs = [stage.func(item) for item in stage.inputs]
+    seconds = time.perf_counter() - started
+    del outputs
+
+    gc.collect()
+    tracemalloc.start()
+    outputs = [stage.func(item) for item in stage.inputs]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del outputs
+
+    return StageResult(
+        items=item_count,
+        seconds=seconds,
+        items_per_second=item_count / seconds if seconds else 0.0,
+        peak_memory_mib=peak / (1 << 20),
+    )
+
+
+def current_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def edict_version() -> str | None:
+    try:
+        return version("edict")
+    except PackageNotFoundError:
+        return None
+
+
+def load_baseline(path: Path, dataset: dict) -> dict | None:
+    """Latest stored run measured on the same synthetic dataset."""
+    if not path.exists():
+        return None
+    runs = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return next((run for run in reversed(runs) if run["dataset"] == dataset), None)
+
+
+def print_summary(results: dict, baseline: dict | None) -> None:
+    print(f"{'stage':<12} {'items':>10} {'items/s':>12} {'peak MiB':>10}", file=sys.stderr)
+    for name, stage in results["stages"].items():
+        line = f"{name:<12} {stage['items']:>10} {stage['items_per_second']:>12.0f} {stage['peak_memory_mib']:>10.1f}"
+        before = baseline["stages"].get(name) if baseline else None
+        if before:
+            line += (
+                f"   vs {baseline['edict_version']}@{baseline['commit']}: "
+                f"items/s {relative_change(before['items_per_second'], stage['items_per_second']):+.1%}  "
+                f"peak {relative_change(before['peak_memory_mib'], stage['peak_memory_mib']):+.1%}"
+            )
+        print(line, file=sys.stderr)
+
+
+def relative_change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRY_COUNT, help="Number of synthetic entries")
+    parser.add_argument("--random-seed", type=int, default=0, help="Seed of the synthetic dataset")
+    parser.add_argument("--results", type=Path, default=RESULTS_FILE_PATH, help="JSON Lines file storing the runs")
+    parser.add_argument("--no-store", action="store_true", help="Compare against stored runs without appending")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    dataset = {"entries": args.entries, "random_seed": args.random_seed}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "jmdict.json"
+        entries = write_dataset(path, args.entries, args.random_seed)
+        stages = build_stages(path, entries)
+        stage_results = {
+            stage.name: asdict(run_stage(stage, len(entries) if stage.name == "load" else len(stage.inputs)))
+            for stage in stages
+        }
+
+    results = {
+        "edict_version": edict_version(),
+        "commit": current_commit(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "dataset": dataset,
+        "stages": stage_results,
+    }
+    print_summary(results, load_baseline(args.results, dataset))
+
+    if not args.no_store:
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        with args.results.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(results) + "\n")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,149 @@
 import json
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import batched
+from multiprocessing.context import BaseContext
 from pathlib import Path
+from typing import Any, TextIO, TypeVar
+
+from edict.errors.helpers import MissingJsonKeyError, UnexpectedJsonTokenError
+
+JSON_CHUNK_SIZE = 1 << 20
+JSON_WHITESPACE = " \t\n\r"
+PARALLEL_BATCH_SIZE = 500
+# Forking a process that has other threads (e.g. a pool started from an `asyncio.to_thread` worker) can deadlock
+# the children, so worker processes are spawned by default
+PARALLEL_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 def load_json_file(path: Path) -> dict:
     with path.open("r", encoding="utf-8") as f:
         data = json.load(f)
     return data
+
+
+class _JsonStream:
+    """Minimal pull reader decoding one JSON value at a time from a sliding text buffer."""
+
+    def __init__(self, file: TextIO, chunk_size: int) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop everything already consumed so the buffer never outgrows one value + one chunk
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next significant character ('' at end of file)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, token: str) -> None:
+        found = self.peek()
+        if found != token:
+            raise UnexpectedJsonTokenError(token, found)
+        self._pos += 1
+
+    def value(self) -> Any:  # noqa: ANN401
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Most likely a value cut by the chunk boundary: read more and retry
+                if not self._fill():
+                    raise
+                continue
+            # A scalar ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json_array(path: Path, key: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Lazily yield the items of the array stored under `key` in a top-level JSON object.
+    Only one item is decoded at a time, so memory stays bounded regardless of the file size.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect("{")
+        while stream.peek() != "}":
+            name = stream.value()
+            stream.expect(":")
+            if name == key:
+                yield from _iter_array_items(stream)
+                return
+            stream.value()
+            if stream.peek() == ",":
+                stream.expect(",")
+        raise MissingJsonKeyError(key)
+
+
+def _iter_array_items(stream: _JsonStream) -> Iterator[Any]:
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+    while True:
+        yield stream.value()
+        if stream.peek() != ",":
+            stream.expect("]")
+            return
+        stream.expect(",")
+
+
+def _map_batch(func: Callable[[T], R], batch: tuple[T, ...]) -> list[R]:
+    return [func(item) for item in batch]
+
+
+def iter_parallel_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    workers: int | None = None,
+    batch_size: int = PARALLEL_BATCH_SIZE,
+    mp_context: BaseContext = PARALLEL_MP_CONTEXT,
+) -> Iterator[R]:
+    """
+    Apply `func` to every item on a process pool, yielding results in input order.
+    Items are shipped in batches and at most two batches per worker are in flight,
+    so a lazy `items` iterator is never drained ahead of the consumer.
+    `func` must be picklable (a module-level function or a classmethod).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(func, items)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        pending: deque[Future[list[R]]] = deque()
+        for batch in batched(items, batch_size):
+            pending.append(executor.submit(_map_batch, func, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,341 @@
+"""
+Compact binary snapshot of parsed `Word`s, opened through `mmap` and decoded one entry at a time.
+
+Layout (little-endian), every section starting on an 8-byte boundary:
+- header: magic, format version, word count, then (offset, size) of each section in `SECTIONS` order
+- string_offsets / strings: every distinct string once, as UTF-8 bytes sliced by n + 1 u32 offsets
+- enums: for each type of `ENUM_TYPES`, its member count followed by the string ids of its values,
+  so codes stay meaningful if members are later added or reordered
+- entry_offsets / records: per word, a run of u32 (its id, then string ids, enum codes and list lengths)
+  delimited by n + 1 offsets
+- sorted_ids / sorted_positions: word ids in ascending order and the entry position of each, for `get`
+
+Opening a snapshot only reads the header and the enum tables; the pages behind the sections are
+shared by every process mapping the same file.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from enum import Enum
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from edict.errors.snapshot import InvalidSnapshotError
+from edict.schemas.helpers import construct_trusted
+from edict.schemas.jmdict import Gloss, Kanji, Reading, Sense, SenseExample, Word
+from edict.types.jmdict import Dialect, GlossType, MiscInformation, PartOfSpeech, SubjectField
+
+SNAPSHOT_MAGIC = b"EDICTSNP"
+SNAPSHOT_FORMAT_VERSION = 1
+
+SECTIONS = ("string_offsets", "strings", "enums", "entry_offsets", "records", "sorted_ids", "sorted_positions")
+HEADER = struct.Struct(f"<8sII{'QQ' * len(SECTIONS)}")
+SECTION_ALIGNMENT = 8
+# Every section but "strings" is an array of native ("I") u32
+UINT32_SIZE = 4
+
+ENUM_TYPES: tuple[type[Enum], ...] = (PartOfSpeech, SubjectField, Dialect, MiscInformation, GlossType)
+
+# Gloss types are optional: 0 stands for None and code + 1 for a member
+NO_GLOSS_TYPE = 0
+
+
+class _SnapshotWriter:
+    def __init__(self) -> None:
+        self.string_ids: dict[str, int] = {}
+        self.strings = bytearray()
+        self.string_offsets = array("I", [0])
+        self.records = array("I")
+        self.entry_offsets = array("I", [0])
+        self.word_ids = array("I")
+        self.enum_codes = {enum: {member: code for code, member in enumerate(enum)} for enum in ENUM_TYPES}
+
+    def string(self, text: str) -> int:
+        string_id = self.string_ids.get(text)
+        if string_id is None:
+            string_id = self.string_ids[text] = len(self.string_ids)
+            self.strings += text.encode()
+            self.string_offsets.append(len(self.strings))
+        return string_id
+
+    def strings_run(self, texts: list[str]) -> None:
+        self.records.append(len(texts))
+        self.records.extend(self.string(text) for text in texts)
+
+    def enums_run(self, enum: type[Enum], members: list[Enum]) -> None:
+        codes = self.enum_codes[enum]
+        self.records.append(len(members))
+        self.records.extend(codes[member] for member in members)
+
+    def add(self, word: Word) -> None:
+        records = self.records
+        records.extend((word.id, len(word.kanjis)))
+        for kanji in word.kanjis:
+            records.extend((self.string(kanji.text), kanji.is_common))
+            self.strings_run(kanji.tags)
+
+        records.append(len(word.readings))
+        for reading in word.readings:
+            records.extend((self.string(reading.text), reading.is_common))
+            self.strings_run(reading.tags)
+            self.strings_run(reading.applies_to_kanji)
+
+        records.append(len(word.senses))
+        for sense in word.senses:
+            self.enums_run(PartOfSpeech, sense.part_of_speech)
+            self.strings_run(sense.applies_to_kanji)
+            self.strings_run(sense.applies_to_reading)
+            self.enums_run(SubjectField, sense.fields)
+            self.enums_run(Dialect, sense.dialects)
+            self.enums_run(MiscInformation, sense.misc)
+            self.strings_run(sense.infos)
+            records.append(len(sense.examples))
+            for example in sense.examples:
+                records.extend(map(self.string, (example.source, example.text, example.jpn, example.eng)))
+            records.append(len(sense.glosses))
+            for gloss in sense.glosses:
+                gloss_type = NO_GLOSS_TYPE if gloss.type is None else self.enum_codes[GlossType][gloss.type] + 1
+                records.extend((gloss_type, self.string(gloss.text)))
+
+        self.word_ids.append(word.id)
+        self.entry_offsets.append(len(records))
+
+    def sections(self) -> dict[str, bytes]:
+        enums = array("I")
+        for enum in ENUM_TYPES:
+            enums.append(len(enum))
+            enums.extend(self.string(member.value) for member in enum)
+
+        order = sorted(range(len(self.word_ids)), key=self.word_ids.__getitem__)
+        sections = {
+            "string_offsets": self.string_offsets,
+            "strings": self.strings,
+            "enums": enums,
+            "entry_offsets": self.entry_offsets,
+            "records": self.records,
+            "sorted_ids": array("I", (self.word_ids[position] for position in order)),
+            "sorted_positions": array("I", order),
+        }
+        if sys.byteorder != "little":
+            for data in sections.values():
+                if isinstance(data, array):
+                    data.byteswap()
+        return {name: bytes(data) for name, data in sections.items()}
+
+
+def write_snapshot(words: Iterable[Word], path: Path) -> int:
+    """Write `words` (e.g. from `iter_words`) to a snapshot file at `path`, returning how many were written."""
+    writer = _SnapshotWriter()
+    for word in words:
+        writer.add(word)
+    sections = writer.sections()
+
+    positions: list[int] = []
+    position = HEADER.size
+    for data in sections.values():
+        position += -position % SECTION_ALIGNMENT
+        positions.extend((position, len(data)))
+        position += len(data)
+
+    with path.open("wb") as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(writer.word_ids), *positions))
+        for offset, data in zip(positions[::2], sections.values(), strict=True):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+    return len(writer.word_ids)
+
+
+class WordSnapshot:
+    """
+    Read-only view of a snapshot file: a sequence of `Word`s decoded on access.
+
+    Decoded words are built without validation, as they were validated before being written.
+    Close the snapshot (or use it as a context manager) once no decoded view is needed anymore.
+    """
+
+    def __init__(self, path: Path) -> None:
+        if sys.byteorder != "little":
+            raise InvalidSnapshotError(path, "snapshots can only be opened on little-endian hosts")
+
+        self.path = path
+        self._sections: dict[str, memoryview] = {}
+        with path.open("rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise InvalidSnapshotError(path, "empty file") from e
+        self._view = memoryview(self._mmap)
+
+        try:
+            self._read_header()
+        except InvalidSnapshotError:
+            self.close()
+            raise
+
+    def _read_header(self) -> None:
+        if len(self._view) < HEADER.size:
+            raise InvalidSnapshotError(self.path, "truncated header")
+        magic, version, self._count, *positions = HEADER.unpack_from(self._view)
+        if magic != SNAPSHOT_MAGIC:
+            raise InvalidSnapshotError(self.path, "bad magic number")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise InvalidSnapshotError(self.path, f"format version {version}, expected {SNAPSHOT_FORMAT_VERSION}")
+
+        # Kept together so `close` can release them before unmapping the file
+        self._sections = sections = {}
+        for name, offset, size in zip(SECTIONS, positions[::2], positions[1::2], strict=True):
+            if offset < HEADER.size or offset % SECTION_ALIGNMENT:
+                raise InvalidSnapshotError(self.path, f"section {name!r} is misplaced (offset {offset})")
+            if offset + size > len(self._view):
+                raise InvalidSnapshotError(self.path, f"section {name!r} runs past the end of the file")
+            if name != "strings" and size % UINT32_SIZE:
+                raise InvalidSnapshotError(self.path, f"section {name!r} is not a whole number of u32 ({size} bytes)")
+            sections[name] = self._view[offset : offset + size]
+            if name != "strings":
+                sections[name] = sections[name].cast("I")
+        self._strings = sections["strings"]
+        self._string_offsets = sections["string_offsets"]
+        self._entry_offsets = sections["entry_offsets"]
+        self._records = sections["records"]
+        self._sorted_ids = sections["sorted_ids"]
+        self._sorted_positions = sections["sorted_positions"]
+        self._enum_members = self._read_enum_tables(sections["enums"].tolist())
+
+    def _read_enum_tables(self, table: list[int]) -> dict[type[Enum], list[Enum]]:
+        members: dict[type[Enum], list[Enum]] = {}
+        position = 0
+        for enum in ENUM_TYPES:
+            size = table[position]
+            values = [self._string(string_id) for string_id in table[position + 1 : position + 1 + size]]
+            position += 1 + size
+            try:
+                members[enum] = [enum(value) for value in values]
+            except ValueError as e:
+                raise InvalidSnapshotError(self.path, f"unknown {enum.__name__} value ({e})") from e
+        return members
+
+    def close(self) -> None:
+        for section in self._sections.values():
+            section.release()
+        self._sections = {}
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Word]:
+        return map(self.__getitem__, range(self._count))
+
+    def __getitem__(self, position: int) -> Word:
+        if not -self._count <= position < self._count:
+            msg = f"Snapshot has {self._count} words, no position {position}"
+            raise IndexError(msg)
+        position %= self._count
+        return self._decode(self._records[self._entry_offsets[position] : self._entry_offsets[position + 1]].tolist())
+
+    def get(self, word_id: int) -> Word | None:
+        """The word with this JMdict sequence id, or None."""
+        index = bisect_left(self._sorted_ids, word_id)
+        if index == self._count or self._sorted_ids[index] != word_id:
+            return None
+        return self[self._sorted_positions[index]]
+
+    def _string(self, string_id: int) -> str:
+        return str(self._strings[self._string_offsets[string_id] : self._string_offsets[string_id + 1]], "utf-8")
+
+    def _decode(self, record: list[int]) -> Word:
+        values = iter(record)
+        word_id = next(values)
+        string = self._string
+        enum_members = self._enum_members
+
+        def strings() -> list[str]:
+            return [string(next(values)) for _ in range(next(values))]
+
+        def enums(enum: type[Enum]) -> list[Enum]:
+            members = enum_members[enum]
+            return [members[next(values)] for _ in range(next(values))]
+
+        kanjis = [
+            construct_trusted(Kanji, {"text": string(next(values)), "is_common": bool(next(values)), "tags": strings()})
+            for _ in range(next(values))
+        ]
+        readings = [
+            construct_trusted(
+                Reading,
+                {
+                    "text": string(next(values)),
+                    "is_common": bool(next(values)),
+                    "tags": strings(),
+                    "applies_to_kanji": strings(),
+                },
+            )
+            for _ in range(next(values))
+        ]
+
+        senses = []
+        gloss_types = enum_members[GlossType]
+        for _ in range(next(values)):
+            part_of_speech = enums(PartOfSpeech)
+            applies_to_kanji = strings()
+            applies_to_reading = strings()
+            fields = enums(SubjectField)
+            dialects = enums(Dialect)
+            misc = enums(MiscInformation)
+            infos = strings()
+            examples = [
+                construct_trusted(
+                    SenseExample,
+                    {
+                        "source": string(next(values)),
+                        "text": string(next(values)),
+                        "jpn": string(next(values)),
+                        "eng": string(next(values)),
+                    },
+                )
+                for _ in range(next(values))
+            ]
+            glosses = []
+            for _ in range(next(values)):
+                gloss_type = next(values)
+                glosses.append(
+                    construct_trusted(
+                        Gloss,
+                        {
+                            "type": None if gloss_type == NO_GLOSS_TYPE else gloss_types[gloss_type - 1],
+                            "text": string(next(values)),
+                        },
+                    )
+                )
+            senses.append(
+                construct_trusted(
+                    Sense,
+                    {
+                        "part_of_speech": part_of_speech,
+                        "applies_to_kanji": applies_to_kanji,
+                        "applies_to_reading": applies_to_reading,
+                        "fields": fields,
+                        "dialects": dialects,
+                        "misc": misc,
+                        "infos": infos,
+                        "examples": examples,
+                        "glosses": glosses,
+                    },
+                )
+            )
+
+        return construct_trusted(Word, {"id": word_id, "kanjis": kanjis, "readings": readings, "senses": senses})
@@ -0,0 +1,8 @@
+class UnexpectedJsonTokenError(Exception):
+    def __init__(self, expected: str, found: str) -> None:
+        super().__init__(f"Expected {expected!r} in JSON stream, found {found or 'end of file'!r}")
+
+
+class MissingJsonKeyError(Exception):
+    def __init__(self, key: str) -> None:
+        super().__init__(f"Top-level JSON object has no key {key!r}")
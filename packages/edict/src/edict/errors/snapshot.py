@@ -0,0 +1,6 @@
+from pathlib import Path
+
+
+class InvalidSnapshotError(Exception):
+    def __init__(self, path: Path, reason: str) -> None:
+        super().__init__(f"{path} is not a usable edict snapshot: {reason}")
@@ -0,0 +1,56 @@
+from enum import Enum
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+E = TypeVar("E", bound=Enum)
+
+
+# Setters of the slots every `BaseModel` instance has, called directly to skip `object.__setattr__` dispatch.
+# These are pydantic internals, hence the exact pydantic pin: tests/test_helpers.py checks them against it
+_set_dict = BaseModel.__dict__["__dict__"].__set__
+_set_fields_set = BaseModel.__dict__["__pydantic_fields_set__"].__set__
+_set_extra = BaseModel.__dict__["__pydantic_extra__"].__set__
+_set_private = BaseModel.__dict__["__pydantic_private__"].__set__
+
+_ALL_FIELDS_SETS: dict[type[BaseModel], set[str]] = {}
+
+
+def construct_trusted(model: type[M], fields: dict[str, Any]) -> M:
+    """
+    Build `model` from a dict holding a valid value for every field, without validation.
+
+    Like `model_construct`, minus its per-field default handling, and all instances of a model
+    share one fields-set instead of allocating their own. `fields` becomes the instance's
+    `__dict__`, so it must not be reused by the caller.
+    """
+    fields_set = _ALL_FIELDS_SETS.get(model)
+    if fields_set is None:
+        fields_set = _ALL_FIELDS_SETS[model] = set(model.model_fields)
+
+    instance = model.__new__(model)
+    _set_dict(instance, fields)
+    _set_fields_set(instance, fields_set)
+    _set_extra(instance, None)
+    _set_private(instance, None)
+    return instance
+
+
+class EnumLookup(Generic[E]):
+    """Cached value -> member mapping of an enum, raising `ValueError` like `enum(value)` for unknown values."""
+
+    def __init__(self, enum: type[E]) -> None:
+        self.enum = enum
+        self._members: dict[Any, E] = {member.value: member for member in enum}
+
+    def __call__(self, value: Any) -> E:  # noqa: ANN401
+        member = self._members.get(value)
+        return self.enum(value) if member is None else member
+
+    def many(self, values: list[Any]) -> list[E]:
+        members = self._members
+        try:
+            return [members[value] for value in values]
+        except KeyError:
+            return [self.enum(value) for value in values]
@@ -1,7 +1,17 @@
 from pydantic import BaseModel, Field
 
+from edict.schemas.helpers import EnumLookup, construct_trusted
 from edict.types.jmdict import Dialect, GlossType, MiscInformation, PartOfSpeech, SubjectField
 
+PART_OF_SPEECH_LOOKUP = EnumLookup(PartOfSpeech)
+SUBJECT_FIELD_LOOKUP = EnumLookup(SubjectField)
+DIALECT_LOOKUP = EnumLookup(Dialect)
+MISC_INFORMATION_LOOKUP = EnumLookup(MiscInformation)
+GLOSS_TYPE_LOOKUP = EnumLookup(GlossType)
+
+# Every `from_json` takes `validate`: False builds models from trusted input (e.g. an already validated
+# dump) without validation, sharing the input's lists instead of copying them.
+
 
 class Kanji(BaseModel):
     """Orthographic form (kanji)."""
@@ -11,12 +21,13 @@ class Kanji(BaseModel):
     tags: list[str] = Field(default_factory=list, description="Extra labels for this kanji")
 
     @classmethod
-    def from_json(cls, json: dict) -> "Kanji":
-        return cls(
-            text=json["text"],
-            is_common=json["common"],
-            tags=json["tags"],
-        )
+    def from_json(cls, json: dict, *, validate: bool = True) -> "Kanji":
+        fields = {
+            "text": json["text"],
+            "is_common": json["common"],
+            "tags": json["tags"],
+        }
+        return cls(**fields) if validate else construct_trusted(cls, fields)
 
 
 class Reading(BaseModel):
@@ -31,13 +42,14 @@ class Reading(BaseModel):
     )
 
     @classmethod
-    def from_json(cls, json: dict) -> "Reading":
-        return cls(
-            text=json["text"],
-            is_common=json["common"],
-            tags=json["tags"],
-            applies_to_kanji=json["appliesToKanji"],
-        )
+    def from_json(cls, json: dict, *, validate: bool = True) -> "Reading":
+        fields = {
+            "text": json["text"],
+            "is_common": json["common"],
+            "tags": json["tags"],
+            "applies_to_kanji": json["appliesToKanji"],
+        }
+        return cls(**fields) if validate else construct_trusted(cls, fields)
 
 
 class SenseExample(BaseModel):
@@ -50,7 +62,7 @@ class SenseExample(BaseModel):
     eng: str = Field(..., description="English translation")
 
     @classmethod
-    def from_json(cls, json: dict) -> "SenseExample":
+    def from_json(cls, json: dict, *, validate: bool = True) -> "SenseExample":
         def _get_sentence_by_lang(sentences: list[dict], lang: str) -> str:
             for item in sentences:
                 if item["land"] == lang:
@@ -58,13 +70,13 @@ class SenseExample(BaseModel):
             return ""
 
         sentences = json["sentences"]
-        source = json["source"]["type"]
-        return cls(
-            source=source,
-            text=json["text"],
-            jpn=_get_sentence_by_lang(sentences, "jpn"),
-            eng=_get_sentence_by_lang(sentences, "eng"),
-        )
+        fields = {
+            "source": json["source"]["type"],
+            "text": json["text"],
+            "jpn": _get_sentence_by_lang(sentences, "jpn"),
+            "eng": _get_sentence_by_lang(sentences, "eng"),
+        }
+        return cls(**fields) if validate else construct_trusted(cls, fields)
 
 
 class Gloss(BaseModel):
@@ -74,12 +86,13 @@ class Gloss(BaseModel):
     text: str = Field(..., description="Definition text")
 
     @classmethod
-    def from_json(cls, json: dict) -> "Gloss":
+    def from_json(cls, json: dict, *, validate: bool = True) -> "Gloss":
         gloss_type = json["type"]
-        return cls(
-            type=GlossType(gloss_type) if gloss_type else None,
-            text=json["text"],
-        )
+        fields = {
+            "type": GLOSS_TYPE_LOOKUP(gloss_type) if gloss_type else None,
+            "text": json["text"],
+        }
+        return cls(**fields) if validate else construct_trusted(cls, fields)
 
 
 class Sense(BaseModel):
@@ -97,18 +110,19 @@ class Sense(BaseModel):
     glosses: list[Gloss] = Field(default_factory=list, description="Definitions for this sense")
 
     @classmethod
-    def from_json(cls, json: dict) -> "Sense":
-        return cls(
-            part_of_speech=[PartOfSpeech(pos) for pos in json["partOfSpeech"]],
-            applies_to_kanji=json["appliesToKanji"],
-            applies_to_reading=json["appliesToKana"],
-            fields=[SubjectField(field) for field in json["field"]],
-            dialects=[Dialect(dialect) for dialect in json["dialect"]],
-            misc=[MiscInformation(m) for m in json["misc"]],
-            infos=json["info"],
-            glosses=[Gloss.from_json(g) for g in json["gloss"]],
-            examples=[SenseExample.from_json(e) for e in json["examples"]],
-        )
+    def from_json(cls, json: dict, *, validate: bool = True) -> "Sense":
+        fields = {
+            "part_of_speech": PART_OF_SPEECH_LOOKUP.many(json["partOfSpeech"]),
+            "applies_to_kanji": json["appliesToKanji"],
+            "applies_to_reading": json["appliesToKana"],
+            "fields": SUBJECT_FIELD_LOOKUP.many(json["field"]),
+            "dialects": DIALECT_LOOKUP.many(json["dialect"]),
+            "misc": MISC_INFORMATION_LOOKUP.many(json["misc"]),
+            "infos": json["info"],
+            "examples": [SenseExample.from_json(e, validate=validate) for e in json["examples"]],
+            "glosses": [Gloss.from_json(g, validate=validate) for g in json["gloss"]],
+        }
+        return cls(**fields) if validate else construct_trusted(cls, fields)
 
 
 class Word(BaseModel):
@@ -121,10 +135,15 @@ class Word(BaseModel):
     senses: list[Sense] = Field(default_factory=list, description="List of senses (meanings)")
 
     @classmethod
-    def from_json(cls, json: dict) -> "Word":
-        return cls(
-            id=json["id"],
-            kanjis=[Kanji.from_json(k) for k in json["kanji"]],
-            readings=[Reading.from_json(r) for r in json["kana"]],
-            senses=[Sense.from_json(s) for s in json["sense"]],
-        )
+    def from_json(cls, json: dict, *, validate: bool = True) -> "Word":
+        fields = {
+            "id": json["id"],
+            "kanjis": [Kanji.from_json(k, validate=validate) for k in json["kanji"]],
+            "readings": [Reading.from_json(r, validate=validate) for r in json["kana"]],
+            "senses": [Sense.from_json(s, validate=validate) for s in json["sense"]],
+        }
+        if validate:
+            return cls(**fields)
+        # JMdict ids are numeric strings, which validation would have converted
+        fields["id"] = int(fields["id"])
+        return construct_trusted(cls, fields)
@@ -0,0 +1,39 @@
+import copy
+import pickle
+
+import pytest
+from edict.schemas.helpers import construct_trusted
+from edict.schemas.jmdict import Gloss, Kanji, Word
+from edict.types.jmdict import GlossType
+from pydantic import BaseModel
+
+# `construct_trusted` writes these `BaseModel` slots directly: a pydantic release renaming or adding one breaks it
+TRUSTED_SLOTS = {"__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__"}
+
+
+def test_base_model_slots_are_the_ones_construct_trusted_fills() -> None:
+    assert set(BaseModel.__slots__) == TRUSTED_SLOTS
+
+
+@pytest.mark.parametrize(
+    ("model", "fields"),
+    [
+        (Kanji, {"text": "食べる", "is_common": True, "tags": []}),
+        (Gloss, {"type": GlossType.LITERAL, "text": "to eat"}),
+        (Word, {"id": 1358280, "kanjis": [], "readings": [], "senses": []}),
+    ],
+)
+def test_trusted_instances_behave_like_validated_ones(model: type[BaseModel], fields: dict) -> None:
+    validated = model(**fields)
+    trusted = construct_trusted(model, dict(fields))
+
+    assert trusted == validated
+    assert repr(trusted) == repr(validated)
+    assert trusted.model_fields_set == validated.model_fields_set
+    assert trusted.__pydantic_extra__ == validated.__pydantic_extra__
+    assert trusted.__pydantic_private__ == validated.__pydantic_private__
+    assert trusted.model_dump() == validated.model_dump()
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert model.model_validate_json(trusted.model_dump_json()) == validated
+    assert copy.deepcopy(trusted) == validated
+    assert pickle.loads(pickle.dumps(trusted)) == validated  # noqa: S301
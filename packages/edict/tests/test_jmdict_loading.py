@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+import pytest
+from edict.core.helpers import PARALLEL_MP_CONTEXT, iter_json_array, iter_parallel_map
+from edict.core.jmdict import iter_words, iter_words_parallel
+from edict.errors.helpers import MissingJsonKeyError
+from edict.schemas.jmdict import Word
+
+
+@pytest.fixture
+def jmdict_file(tmp_path: Path, sample_entries: list[dict]) -> Path:
+    path = tmp_path / "jmdict.json"
+    document = {
+        "version": "3.6.1",
+        "languages": ["eng"],
+        "dictRevisions": ["1.09"],
+        "tags": {"adv": "adverb (fukushi)"},
+        "words": sample_entries,
+    }
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_streams_array_items_across_chunk_boundaries(
+    jmdict_file: Path, sample_entries: list[dict], chunk_size: int
+) -> None:
+    assert list(iter_json_array(jmdict_file, "words", chunk_size)) == sample_entries
+
+
+def test_streams_empty_array(tmp_path: Path) -> None:
+    path = tmp_path / "empty.json"
+    path.write_text('{"version": 12, "words": [ ]}', encoding="utf-8")
+    assert list(iter_json_array(path, "words", chunk_size=3)) == []
+
+
+def test_raises_on_missing_key(jmdict_file: Path) -> None:
+    with pytest.raises(MissingJsonKeyError):
+        list(iter_json_array(jmdict_file, "kanji"))
+
+
+def test_iter_words_matches_eager_parsing(jmdict_file: Path, sample_entries: list[dict]) -> None:
+    assert list(iter_words(jmdict_file, chunk_size=128)) == [Word.from_json(entry) for entry in sample_entries]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_words_parallel_preserves_order(jmdict_file: Path, workers: int) -> None:
+    words = list(iter_words_parallel(jmdict_file, workers=workers, batch_size=1))
+    assert words == list(iter_words(jmdict_file))
+
+
+def test_iter_words_parallel_without_validation(jmdict_file: Path) -> None:
+    words = list(iter_words_parallel(jmdict_file, workers=2, batch_size=1, validate=False))
+    assert words == list(iter_words(jmdict_file))
+
+
+def test_parallel_map_does_not_fork_by_default() -> None:
+    assert PARALLEL_MP_CONTEXT.get_start_method() != "fork"
+    assert list(iter_parallel_map(abs, range(-3, 3), workers=2, batch_size=1)) == [3, 2, 1, 0, 1, 2]
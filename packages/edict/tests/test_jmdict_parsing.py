@@ -1,3 +1,4 @@
+import pytest
 from edict.schemas.jmdict import (
     Gloss,
     Kanji,
@@ -9,6 +10,7 @@ from edict.schemas.jmdict import (
     SubjectField,
     Word,
 )
+from pydantic import ValidationError
 
 PARSED_SAMPLES = [
     Word(
@@ -145,3 +147,15 @@ PARSED_SAMPLES = [
 def test_correctly_parses_words(sample_entries: list[dict]) -> None:
     words = [Word.from_json(entry) for entry in sample_entries]
     assert words == PARSED_SAMPLES
+
+
+def test_trusted_parsing_matches_validated_parsing(sample_entries: list[dict]) -> None:
+    words = [Word.from_json(entry, validate=False) for entry in sample_entries]
+    assert words == PARSED_SAMPLES
+    assert [word.model_dump() for word in words] == [word.model_dump() for word in PARSED_SAMPLES]
+
+
+@pytest.mark.parametrize("word_id", [1.5, "abc"])
+def test_validated_parsing_rejects_invalid_ids(sample_entries: list[dict], word_id: float | str) -> None:
+    with pytest.raises(ValidationError):
+        Word.from_json(sample_entries[0] | {"id": word_id})
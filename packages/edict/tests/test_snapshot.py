@@ -0,0 +1,70 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from edict.core.snapshot import HEADER, SECTIONS, WordSnapshot, write_snapshot
+from edict.errors.snapshot import InvalidSnapshotError
+from edict.schemas.jmdict import Word
+
+
+@pytest.fixture
+def words(sample_entries: list[dict]) -> list[Word]:
+    return [Word.from_json(entry) for entry in sample_entries]
+
+
+@pytest.fixture
+def snapshot_file(tmp_path: Path, words: list[Word]) -> Path:
+    path = tmp_path / "jmdict.snapshot"
+    write_snapshot(words, path)
+    return path
+
+
+def test_round_trips_words(snapshot_file: Path, words: list[Word]) -> None:
+    with WordSnapshot(snapshot_file) as snapshot:
+        assert len(snapshot) == len(words)
+        assert list(snapshot) == words
+        assert snapshot[-1] == words[-1]
+
+
+def test_gets_words_by_id(snapshot_file: Path, words: list[Word]) -> None:
+    with WordSnapshot(snapshot_file) as snapshot:
+        for word in words:
+            assert snapshot.get(word.id) == word
+        assert snapshot.get(1) is None
+
+
+def test_rejects_other_files(tmp_path: Path, snapshot_file: Path) -> None:
+    not_a_snapshot = tmp_path / "jmdict.json"
+    not_a_snapshot.write_text('{"words": []}' * 20, encoding="utf-8")
+    with pytest.raises(InvalidSnapshotError):
+        WordSnapshot(not_a_snapshot)
+
+    truncated = tmp_path / "truncated.snapshot"
+    truncated.write_bytes(snapshot_file.read_bytes()[:-64])
+    with pytest.raises(InvalidSnapshotError):
+        WordSnapshot(truncated)
+
+
+@pytest.mark.parametrize(
+    ("section", "change"),
+    [
+        # A u32 section whose size is not a multiple of 4
+        ("records", lambda offset, size: (offset, size - 1)),
+        # A section moved off its alignment, or onto the header
+        ("entry_offsets", lambda offset, size: (offset + 4, size - 4)),
+        ("string_offsets", lambda _offset, size: (0, size)),
+    ],
+)
+def test_rejects_corrupt_section_tables(
+    tmp_path: Path, snapshot_file: Path, section: str, change: Callable[[int, int], tuple[int, int]]
+) -> None:
+    data = bytearray(snapshot_file.read_bytes())
+    magic, version, count, *positions = HEADER.unpack_from(data)
+    index = 2 * SECTIONS.index(section)
+    positions[index : index + 2] = change(*positions[index : index + 2])
+    HEADER.pack_into(data, 0, magic, version, count, *positions)
+
+    corrupt = tmp_path / "corrupt.snapshot"
+    corrupt.write_bytes(data)
+    with pytest.raises(InvalidSnapshotError):
+        WordSnapshot(corrupt)
@@ -0,0 +1,47 @@
+"""stored gloss tsvector
+
+Revision ID: 47d63a83ecf2
+Revises: 5476e368cea5
+Create Date: 2026-10-17 10:03:18.774105
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "47d63a83ecf2"
+down_revision: str | Sequence[str] | None = "5476e368cea5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "glosses",
+        sa.Column(
+            "text_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_glosses_text_tsv",
+        "glosses",
+        ["text_tsv"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.execute("DROP INDEX IF EXISTS ix_glosses_text_fts")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("CREATE INDEX ix_glosses_text_fts ON glosses USING GIN (to_tsvector('english', coalesce(text, '')))")
+    op.drop_index("ix_glosses_text_tsv", table_name="glosses")
+    op.drop_column("glosses", "text_tsv")
@@ -0,0 +1,28 @@
+"""word content hash
+
+Revision ID: 5476e368cea5
+Revises: b2ceaffcb2fe
+Create Date: 2026-10-17 09:12:41.502317
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5476e368cea5"
+down_revision: str | Sequence[str] | None = "b2ceaffcb2fe"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("words", sa.Column("content_hash", sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("words", "content_hash")
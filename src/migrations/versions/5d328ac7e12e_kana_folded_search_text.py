@@ -0,0 +1,75 @@
+"""kana folded search text
+
+Revision ID: 5d328ac7e12e
+Revises: 6bdb32947508
+Create Date: 2026-10-17 15:02:41.318904
+
+"""
+
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d328ac7e12e"
+down_revision: str | Sequence[str] | None = "6bdb32947508"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PREFIX_TABLES = ("readings", "kanjis")
+BATCH_SIZE = 10_000
+
+# Frozen copy of `wisho.core.helpers.search_key` as of this revision, so replaying it always yields the same keys
+LONG_VOWEL_MARK = "ー"
+SMALL_KANA_TABLE = str.maketrans("ぁぃぅぇぉっゃゅょゎゕゖ", "あいうえおつやゆよわかけ")
+KANA_FOLD_TABLE = {
+    code: SMALL_KANA_TABLE.get(code - 0x60, code - 0x60) for code in range(0x30A1, 0x30F7)
+} | SMALL_KANA_TABLE
+KANA_VOWELS = {
+    kana: vowel
+    for vowel, row in (
+        ("あ", "あかがさざただなはばぱまやらわ"),
+        ("い", "いきぎしじちぢにひびぴみりゐ"),
+        ("う", "うくぐすずつづぬふぶぷむゆるゔ"),
+        ("え", "えけげせぜてでねへべぺめれゑ"),
+        ("お", "おこごそぞとどのほぼぽもよろを"),
+    )
+    for kana in row
+}
+
+
+def search_key(text: str) -> str:
+    folded: list[str] = []
+    for char in unicodedata.normalize("NFKC", text).strip().lower().translate(KANA_FOLD_TABLE):
+        if char == LONG_VOWEL_MARK and folded and folded[-1] in KANA_VOWELS:
+            folded.append(KANA_VOWELS[folded[-1]])
+        else:
+            folded.append(char)
+    return "".join(folded)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Kana folding has no SQL equivalent, so keys are recomputed here, one batch of rows at a time
+    bind = op.get_bind()
+    for table in PREFIX_TABLES:
+        select_batch = sa.text(f"SELECT id, text, search_text FROM {table} WHERE id > :after ORDER BY id LIMIT :size")  # noqa: S608
+        update_key = sa.text(f"UPDATE {table} SET search_text = :search_text WHERE id = :id")  # noqa: S608
+        after = 0
+        while rows := bind.execute(select_batch, {"after": after, "size": BATCH_SIZE}).all():
+            updates = [
+                {"id": row_id, "search_text": key}
+                for row_id, text, search_text in rows
+                if (key := search_key(text)) != search_text
+            ]
+            if updates:
+                bind.execute(update_key, updates)
+            after = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in PREFIX_TABLES:
+        op.execute(f"UPDATE {table} SET search_text = lower(btrim(normalize(text, NFKC)))")  # noqa: S608
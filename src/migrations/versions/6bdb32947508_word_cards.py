@@ -0,0 +1,62 @@
+"""word cards
+
+Revision ID: 6bdb32947508
+Revises: 2f8cdc6f820e
+Create Date: 2026-10-17 14:47:30.218764
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "6bdb32947508"
+down_revision: str | Sequence[str] | None = "2f8cdc6f820e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "word_cards",
+        sa.Column("word_id", sa.Integer(), nullable=False),
+        sa.Column("readings", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("kanjis", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("glosses", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("is_common", sa.Boolean(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["word_id"], ["words.id"]),
+        sa.PrimaryKeyConstraint("word_id"),
+    )
+    # Mirrors the cards built by the seed script
+    op.execute(
+        """
+        INSERT INTO word_cards (word_id, readings, kanjis, glosses, is_common, payload)
+        SELECT
+            cards.id, cards.readings, cards.kanjis, cards.glosses, cards.is_common,
+            json_build_object(
+                'id', cards.id, 'kanjis', cards.kanjis, 'readings', cards.readings, 'glosses', cards.glosses
+            )::text
+        FROM (
+            SELECT
+                words.id,
+                words.is_common,
+                ARRAY(SELECT text FROM readings WHERE word_id = words.id ORDER BY id) AS readings,
+                ARRAY(SELECT text FROM kanjis WHERE word_id = words.id ORDER BY id) AS kanjis,
+                ARRAY(
+                    SELECT glosses.text FROM glosses JOIN senses ON senses.id = glosses.sense_id
+                    WHERE senses.word_id = words.id ORDER BY glosses.id LIMIT 3
+                ) AS glosses
+            FROM words
+        ) AS cards
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("word_cards")
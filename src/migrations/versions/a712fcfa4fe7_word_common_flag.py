@@ -0,0 +1,35 @@
+"""word common flag
+
+Revision ID: a712fcfa4fe7
+Revises: 47d63a83ecf2
+Create Date: 2026-10-17 10:41:55.318640
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a712fcfa4fe7"
+down_revision: str | Sequence[str] | None = "47d63a83ecf2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("words", sa.Column("is_common", sa.Boolean(), server_default="false", nullable=False))
+    op.execute(
+        """
+        UPDATE words SET is_common =
+            EXISTS (SELECT 1 FROM readings WHERE readings.word_id = words.id AND readings.is_common)
+            OR EXISTS (SELECT 1 FROM kanjis WHERE kanjis.word_id = words.id AND kanjis.is_common)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("words", "is_common")
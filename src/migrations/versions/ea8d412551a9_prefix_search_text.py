@@ -0,0 +1,58 @@
+"""prefix search text
+
+Revision ID: ea8d412551a9
+Revises: a712fcfa4fe7
+Create Date: 2026-10-17 11:26:07.940152
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ea8d412551a9"
+down_revision: str | Sequence[str] | None = "a712fcfa4fe7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PREFIX_TABLES = ("readings", "kanjis")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in PREFIX_TABLES:
+        op.add_column(table, sa.Column("search_text", sa.String(collation="C"), nullable=True))
+        # Mirrors wisho.core.helpers.search_key
+        op.execute(f"UPDATE {table} SET search_text = lower(btrim(normalize(text, NFKC)))")  # noqa: S608
+        op.alter_column(table, "search_text", nullable=False)
+        op.create_index(op.f(f"ix_{table}_search_text"), table, ["search_text"], unique=False)
+
+    # The trigram indexes only served the old ILIKE prefix lookups
+    op.drop_index("ix_kanjis_text_trgm", table_name="kanjis")
+    op.drop_index("ix_readings_text_trgm", table_name="readings")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_readings_text_trgm",
+        "readings",
+        ["text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"text": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_kanjis_text_trgm",
+        "kanjis",
+        ["text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"text": "gin_trgm_ops"},
+    )
+
+    for table in PREFIX_TABLES:
+        op.drop_index(op.f(f"ix_{table}_search_text"), table_name=table)
+        op.drop_column(table, "search_text")
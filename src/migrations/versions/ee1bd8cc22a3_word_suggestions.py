@@ -0,0 +1,35 @@
+"""word suggestions
+
+Revision ID: ee1bd8cc22a3
+Revises: fb3bc16c82f7
+Create Date: 2026-10-17 16:12:54.730418
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "ee1bd8cc22a3"
+down_revision: str | Sequence[str] | None = "fb3bc16c82f7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by the seed script, which rebuilds it whenever the dictionary changes or it is empty
+    op.create_table(
+        "word_suggestions",
+        sa.Column("prefix", sa.String(collation="C"), nullable=False),
+        sa.Column("word_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.PrimaryKeyConstraint("prefix"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("word_suggestions")
@@ -0,0 +1,113 @@
+"""reading romaji
+
+Revision ID: fb3bc16c82f7
+Revises: 5d328ac7e12e
+Create Date: 2026-10-17 15:41:09.552087
+
+"""
+
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "fb3bc16c82f7"
+down_revision: str | Sequence[str] | None = "5d328ac7e12e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH_SIZE = 10_000
+
+# Frozen copy of `wisho.core.romaji.kana_to_romaji` as of this revision, so replaying it always yields the same romaji
+VOWELS = "aiueo"
+SOKUON = "っ"
+LONG_VOWEL_MARK = "ー"
+KATAKANA_TO_HIRAGANA_TABLE = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+KANA_ROMAJI = {
+    kana: consonant + vowel
+    for consonant, row in (
+        ("", "あいうえお"),
+        ("k", "かきくけこ"),
+        ("g", "がぎぐげご"),
+        ("s", "さしすせそ"),
+        ("z", "ざじずぜぞ"),
+        ("t", "たちつてと"),
+        ("d", "だぢづでど"),
+        ("n", "なにぬねの"),
+        ("h", "はひふへほ"),
+        ("b", "ばびぶべぼ"),
+        ("p", "ぱぴぷぺぽ"),
+        ("m", "まみむめも"),
+        ("r", "らりるれろ"),
+    )
+    for kana, vowel in zip(row, VOWELS, strict=True)
+} | dict(
+    zip(
+        "しじちつぢづふやゆよわゐゑをんゔぁぃぅぇぉゃゅょゎゕゖ",
+        "shi ji chi tsu ji zu fu ya yu yo wa i e o n vu a i u e o ya yu yo wa ka ke".split(),
+        strict=True,
+    )
+)
+KANA_DIGRAPH_ROMAJI = {
+    base + small: (stem if stem in {"sh", "ch", "j"} else stem + "y") + vowel
+    for base in "きぎしじちぢにひびぴみり"
+    for stem in (KANA_ROMAJI[base][:-1],)
+    for small, vowel in (("ゃ", "a"), ("ゅ", "u"), ("ょ", "o"))
+} | dict(
+    zip(
+        "しぇ じぇ ちぇ ふぁ ふぃ ふぇ ふぉ てぃ でぃ うぃ うぇ うぉ ゔぁ ゔぃ ゔぇ ゔぉ".split(),
+        "she je che fa fi fe fo ti di wi we wo va vi ve vo".split(),
+        strict=True,
+    )
+)
+
+
+def kana_to_romaji(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).strip().lower().translate(KATAKANA_TO_HIRAGANA_TABLE)
+    parts: list[str] = []
+    double_next = False
+    position = 0
+    while position < len(text):
+        if (romaji := KANA_DIGRAPH_ROMAJI.get(text[position : position + 2])) is not None:
+            position += 2
+        else:
+            char = text[position]
+            position += 1
+            if char == SOKUON:
+                double_next = True
+                continue
+            if char == LONG_VOWEL_MARK:
+                romaji = parts[-1][-1] if parts and parts[-1] and parts[-1][-1] in VOWELS else ""
+            else:
+                romaji = KANA_ROMAJI.get(char, char)
+
+        if double_next and romaji and romaji[0] not in VOWELS:
+            romaji = romaji[0] + romaji
+        double_next = False
+        parts.append(romaji)
+    return "".join(parts)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("readings", sa.Column("romaji", sa.String(collation="C"), nullable=True))
+
+    # Transliteration has no SQL equivalent, so it is computed here, one batch of rows at a time
+    bind = op.get_bind()
+    select_batch = sa.text("SELECT id, text FROM readings WHERE id > :after ORDER BY id LIMIT :size")
+    update_romaji = sa.text("UPDATE readings SET romaji = :romaji WHERE id = :id")
+    after = 0
+    while rows := bind.execute(select_batch, {"after": after, "size": BATCH_SIZE}).all():
+        bind.execute(update_romaji, [{"id": row_id, "romaji": kana_to_romaji(text)} for row_id, text in rows])
+        after = rows[-1][0]
+
+    op.alter_column("readings", "romaji", nullable=False)
+    op.create_index(op.f("ix_readings_romaji"), "readings", ["romaji"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_readings_romaji"), table_name="readings")
+    op.drop_column("readings", "romaji")
@@ -0,0 +1,287 @@
+# /// script
+# requires-python = ">=3.12"
+# dependencies = [
+#     "asyncpg",
+#     "edict",
+#     "httpx",
+#     "sqlalchemy",
+#     "wisho",
+# ]
+# ///
+"""
+Load-test `/api/v1/search` with a fixed query mix and report throughput and latency per query class.
+
+Typical run, against a server started with `wisho` on a database seeded from the bundled dictionary:
+
+    uv run src/scripts/benchmark.py --seed --concurrency 32 --duration 30 --output bench.json
+    uv run src/scripts/benchmark.py --compare bench.json
+
+Results are written as JSON (stdout by default) along with the commit and dataset digest, so runs
+from different commits can be compared with `--compare`. Start the server with SEARCH_CACHE_MAX_SIZE=0
+to measure the repository rather than the result cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+# `seed.py` is a sibling script rather than an installed module, so it is imported from this file's
+# directory: that works whatever the working directory and however this script is started
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seed import DICTIONARY_FILE_PATH, seed_database
+
+SEARCH_PATH = "/api/v1/search"
+
+# Fixed query set: changing it makes results incomparable with earlier runs
+QUERY_CLASSES: dict[str, tuple[str, ...]] = {
+    "japanese_prefix": (
+        "たべ",
+        "のみ",
+        "がっこ",
+        "でんしゃ",
+        "あたらし",
+        "はし",
+        "みず",
+        "ひと",
+        "きょう",
+        "おお",
+        "カタカ",
+        "ラーメ",
+        "こんにち",
+        "べんきょ",
+        "しごと",
+        "食べ",
+        "日本",
+        "電車",
+        "新し",
+        "勉強",
+    ),
+    "single_kanji": ("日", "人", "食", "水", "学", "大", "見", "行", "本", "山", "時", "気", "手", "生", "出"),
+    "english": (
+        "eat",
+        "water",
+        "school",
+        "train",
+        "to go",
+        "beautiful",
+        "book",
+        "mountain",
+        "person",
+        "new",
+        "study",
+        "work",
+        "delicious",
+        "tomorrow",
+        "red",
+    ),
+    "romaji": ("taberu", "nomu", "gakkou", "densha", "sakura", "kyou", "arigatou", "tsukue", "hon", "yama"),
+}
+
+DEFAULT_MIX = "japanese_prefix=4,single_kanji=1,english=4,romaji=1"
+PERCENTILES = {"p50_ms": 49, "p95_ms": 94, "p99_ms": 98}
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    base_url: str
+    concurrency: int
+    duration: float
+    warmup: float
+    limit: int
+    mix: dict[str, int]
+    random_seed: int
+
+
+@dataclass
+class ClassStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, float | int]:
+        latencies = self.latencies_ms
+        summary: dict[str, float | int] = {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+            "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        }
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        for name, index in PERCENTILES.items():
+            summary[name] = cuts[index] if cuts else 0.0
+        return summary
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in QUERY_CLASSES:
+            msg = f"Unknown query class {name!r}, expected one of {', '.join(QUERY_CLASSES)}"
+            raise argparse.ArgumentTypeError(msg)
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def build_schedule(mix: dict[str, int], rng: random.Random) -> list[tuple[str, str]]:
+    """One deterministic round of (class, query) pairs, each class repeated according to its weight."""
+    schedule = [(name, query) for name, weight in mix.items() for query in QUERY_CLASSES[name] * weight]
+    rng.shuffle(schedule)
+    return schedule
+
+
+def current_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def dataset_digest(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def run_load(config: LoadConfig, schedule: list[tuple[str, str]]) -> dict[str, ClassStats]:
+    """
+    Closed-loop load: `concurrency` workers walk the schedule in turn, each sending its next request
+    as soon as the previous one completes. Requests started during the warmup are not recorded.
+    """
+    stats: dict[str, ClassStats] = defaultdict(ClassStats)
+    cursor = 0
+    limits = httpx.Limits(max_connections=config.concurrency, max_keepalive_connections=config.concurrency)
+
+    async with httpx.AsyncClient(base_url=config.base_url, limits=limits, timeout=30.0) as client:
+        record_from = time.perf_counter() + config.warmup
+        stop_at = record_from + config.duration
+
+        async def worker() -> None:
+            nonlocal cursor
+            while (now := time.perf_counter()) < stop_at:
+                query_class, query = schedule[cursor % len(schedule)]
+                cursor += 1
+                try:
+                    response = await client.get(SEARCH_PATH, params={"q": query, "limit": config.limit})
+                    ok = response.status_code == httpx.codes.OK
+                except httpx.HTTPError:
+                    ok = False
+                if now < record_from:
+                    continue
+                if ok:
+                    stats[query_class].latencies_ms.append((time.perf_counter() - now) * 1000)
+                else:
+                    stats[query_class].errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+
+    return stats
+
+
+def report(stats: dict[str, ClassStats], config: LoadConfig) -> dict:
+    overall = ClassStats()
+    for class_stats in stats.values():
+        overall.latencies_ms.extend(class_stats.latencies_ms)
+        overall.errors += class_stats.errors
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "dataset": {"path": str(DICTIONARY_FILE_PATH), "digest": dataset_digest(DICTIONARY_FILE_PATH)},
+        "config": asdict(config),
+        "total": overall.summary(config.duration),
+        "classes": {name: stats[name].summary(config.duration) for name in sorted(stats)},
+    }
+
+
+def print_summary(results: dict, baseline: dict | None) -> None:
+    rows = [("total", results["total"]), *results["classes"].items()]
+    print(f"{'class':<16} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}", file=sys.stderr)
+    for name, summary in rows:
+        line = (
+            f"{name:<16} {summary['throughput_rps']:>9.1f} {summary['p50_ms']:>7.1f}ms "
+            f"{summary['p95_ms']:>6.1f}ms {summary['p99_ms']:>6.1f}ms {summary['errors']:>7}"
+        )
+        if baseline is not None:
+            before = baseline["total"] if name == "total" else baseline["classes"].get(name)
+            if before:
+                line += "   vs baseline: " + "  ".join(
+                    f"{label} {relative_change(before[key], summary[key]):+.1%}"
+                    for label, key in (("req/s", "throughput_rps"), *((key[:3], key) for key in PERCENTILES))
+                )
+        print(line, file=sys.stderr)
+
+
+def relative_change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server to benchmark")
+    parser.add_argument("--seed", action="store_true", help="Sync the database with the bundled dictionary first")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unrecorded seconds before measuring")
+    parser.add_argument("--limit", type=int, default=20, help="`limit` sent with every search")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"Class weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--random-seed", type=int, default=0, help="Seed of the query order")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON results to print relative changes against")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    if args.seed:
+        await seed_database()
+
+    config = LoadConfig(
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        limit=args.limit,
+        mix=args.mix,
+        random_seed=args.random_seed,
+    )
+    # Only the query order is randomized, and it must be reproducible
+    schedule = build_schedule(config.mix, random.Random(config.random_seed))  # noqa: S311
+    stats = await run_load(config, schedule)
+
+    results = report(stats, config)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_summary(results, baseline)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,116 +1,439 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
+#     "asyncpg",
 #     "edict",
 #     "sqlalchemy",
 #     "wisho",
 # ]
 # ///
+from __future__ import annotations
+
+import argparse
 import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from itertools import batched, islice
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from edict.core.helpers import load_json_file
-from edict.schemas.jmdict import Word as WordDTO
-from sqlalchemy import select
+from edict.core.jmdict import iter_words_parallel
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 
 from wisho.core.db.session import local_session
-from wisho.models.jmdict import Gloss, Kanji, Reading, Sense, SenseExample, Word
+from wisho.core.helpers import search_key
+from wisho.core.romaji import kana_to_romaji
+from wisho.models.dataset import DATASET_VERSION_ROW_ID, DatasetVersion
+from wisho.models.jmdict import (
+    WORD_CARD_GLOSS_LIMIT,
+    WORD_SUGGESTION_LIMIT,
+    Gloss,
+    Kanji,
+    Reading,
+    Sense,
+    SenseExample,
+    Word,
+    WordCard,
+    WordSuggestion,
+)
+from wisho.repositories.prefix_index import PrefixIndex
+from wisho.repositories.word import SearchWeights
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from asyncpg import Connection
+    from edict.schemas.jmdict import Word as WordDTO
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 DICTIONARY_FILE_PATH = Path(__file__).resolve().parents[2] / "packages" / "edict" / "resources" / "jmdict.json"
 
+COPY_BATCH_SIZE = 5000
 
-def pydantic_to_sqlalchemy(edict_word: WordDTO) -> Word:
-    word = Word(id=edict_word.id)
+# Column layout of every COPY, in foreign-key dependency order
+COPY_COLUMNS: dict[str, tuple[str, ...]] = {
+    Word.__tablename__: ("id", "content_hash", "is_common"),
+    WordCard.__tablename__: ("word_id", "readings", "kanjis", "glosses", "is_common", "payload"),
+    Kanji.__tablename__: ("id", "word_id", "text", "search_text", "is_common", "tags"),
+    Reading.__tablename__: (
+        "id",
+        "word_id",
+        "text",
+        "search_text",
+        "romaji",
+        "is_common",
+        "tags",
+        "applies_to_kanji",
+    ),
+    Sense.__tablename__: (
+        "id",
+        "word_id",
+        "part_of_speech",
+        "applies_to_kanji",
+        "applies_to_reading",
+        "fields",
+        "dialects",
+        "misc",
+        "infos",
+    ),
+    Gloss.__tablename__: ("id", "sense_id", "type", "text"),
+    SenseExample.__tablename__: ("id", "sense_id", "source", "text", "jpn", "eng"),
+}
 
-    for kanji in edict_word.kanjis:
-        word.kanjis.append(
-            Kanji(
-                text=kanji.text,
-                is_common=kanji.is_common,
-                tags=kanji.tags,
-            )
-        )
+SUGGESTION_COLUMNS = ("prefix", "word_ids")
 
-    for reading in edict_word.readings:
-        word.readings.append(
-            Reading(
-                text=reading.text,
-                is_common=reading.is_common,
-                tags=reading.tags,
-                applies_to_kanji=reading.applies_to_kanji,
-            )
-        )
+SERIAL_MODELS = (Kanji, Reading, Sense, Gloss, SenseExample)
 
-    for sense in edict_word.senses:
-        db_sense = Sense(
-            part_of_speech=[pos.value for pos in sense.part_of_speech],
-            applies_to_kanji=sense.applies_to_kanji,
-            applies_to_reading=sense.applies_to_reading,
-            fields=[field.value for field in sense.fields],
-            dialects=[dialect.value for dialect in sense.dialects],
-            misc=[misc.value for misc in sense.misc],
-            infos=sense.infos,
-        )
+# Tables whose serial ids are assigned client-side and must be re-synced after the load
+SERIAL_TABLES = tuple(model.__tablename__ for model in SERIAL_MODELS)
+
+
+def to_json(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def word_card_record(word: WordDTO, *, is_common: bool) -> tuple:
+    readings = [reading.text for reading in word.readings]
+    kanjis = [kanji.text for kanji in word.kanjis]
+    glosses = [gloss.text for sense in word.senses for gloss in sense.glosses][:WORD_CARD_GLOSS_LIMIT]
+    payload = to_json({"id": word.id, "kanjis": kanjis, "readings": readings, "glosses": glosses})
+    return (word.id, readings, kanjis, glosses, is_common, payload)
+
+
+def content_hash(word: WordDTO) -> str:
+    """Stable digest of everything we store for a word, used to detect changed entries."""
+    return hashlib.blake2b(word.model_dump_json().encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class SyncStats:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+@dataclass
+class CopyStats:
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class BulkLoader:
+    """
+    Turn edict words into row tuples with client-side ids and push them
+    table by table through asyncpg's binary COPY, bypassing the ORM unit of work.
+
+    Loading is differential: words whose content hash matches the stored one are
+    skipped, changed words are deleted and re-copied, and words that disappeared
+    from the dictionary are removed by `delete_missing`. On an empty database this
+    degrades to a plain full load. The search keys of every changed form, old and new,
+    are kept so `refresh_suggestions` only re-ranks the prefixes they affect.
+    """
+
+    def __init__(self, session: AsyncSession, connection: Connection) -> None:
+        self.session = session
+        self.connection = connection
+        self.next_ids = dict.fromkeys(SERIAL_TABLES, 1)
+        self.records: dict[str, list[tuple]] = {table: [] for table in COPY_COLUMNS}
+        self.stats = {table: CopyStats() for table in (*COPY_COLUMNS, WordSuggestion.__tablename__)}
+        self.sync = SyncStats()
+        self.stored_hashes: dict[int, str | None] = {}
+        self.seen_ids: set[int] = set()
+        self.pending_replacements: list[int] = []
+        self.changed_keys: set[str] = set()
+
+    async def prepare(self) -> None:
+        """Load the stored hashes and continue id assignment after the current maximum of every table."""
+        result = await self.session.execute(select(Word.id, Word.content_hash))
+        self.stored_hashes = dict(result.tuples().all())
+
+        for model in SERIAL_MODELS:
+            max_id = await self.session.scalar(select(func.coalesce(func.max(model.id), 0)))
+            self.next_ids[model.__tablename__] = max_id + 1
+
+    def _next_id(self, table: str) -> int:
+        next_id = self.next_ids[table]
+        self.next_ids[table] = next_id + 1
+        return next_id
+
+    def add(self, word: WordDTO) -> None:
+        digest = content_hash(word)
+        self.seen_ids.add(word.id)
+
+        if word.id in self.stored_hashes:
+            if self.stored_hashes[word.id] == digest:
+                self.sync.unchanged += 1
+                return
+            self.pending_replacements.append(word.id)
+            self.sync.updated += 1
+        else:
+            self.sync.inserted += 1
+
+        is_common = any(kanji.is_common for kanji in word.kanjis) or any(r.is_common for r in word.readings)
+        self.records[Word.__tablename__].append((word.id, digest, is_common))
+        self.records[WordCard.__tablename__].append(word_card_record(word, is_common=is_common))
 
-        for gloss in sense.glosses:
-            db_sense.glosses.append(
-                Gloss(
-                    type=gloss.type.value if gloss.type else None,
-                    text=gloss.text,
+        for kanji in word.kanjis:
+            kanji_key = search_key(kanji.text)
+            self.changed_keys.add(kanji_key)
+            self.records[Kanji.__tablename__].append(
+                (
+                    self._next_id(Kanji.__tablename__),
+                    word.id,
+                    kanji.text,
+                    kanji_key,
+                    kanji.is_common,
+                    to_json(kanji.tags),
                 )
             )
 
-        for example in sense.examples:
-            db_sense.examples.append(
-                SenseExample(
-                    source=example.source,
-                    text=example.text,
-                    jpn=example.jpn,
-                    eng=example.eng,
+        for reading in word.readings:
+            reading_key = search_key(reading.text)
+            self.changed_keys.add(reading_key)
+            self.records[Reading.__tablename__].append(
+                (
+                    self._next_id(Reading.__tablename__),
+                    word.id,
+                    reading.text,
+                    reading_key,
+                    kana_to_romaji(reading.text),
+                    reading.is_common,
+                    to_json(reading.tags),
+                    to_json(reading.applies_to_kanji),
                 )
             )
 
-        word.senses.append(db_sense)
+        for sense in word.senses:
+            sense_id = self._next_id(Sense.__tablename__)
+            self.records[Sense.__tablename__].append(
+                (
+                    sense_id,
+                    word.id,
+                    to_json([pos.value for pos in sense.part_of_speech]),
+                    to_json(sense.applies_to_kanji),
+                    to_json(sense.applies_to_reading),
+                    to_json([field.value for field in sense.fields]),
+                    to_json([dialect.value for dialect in sense.dialects]),
+                    to_json([misc.value for misc in sense.misc]),
+                    to_json(sense.infos),
+                )
+            )
 
-    return word
+            for gloss in sense.glosses:
+                self.records[Gloss.__tablename__].append(
+                    (
+                        self._next_id(Gloss.__tablename__),
+                        sense_id,
+                        gloss.type.value if gloss.type else None,
+                        gloss.text,
+                    )
+                )
 
+            for example in sense.examples:
+                self.records[SenseExample.__tablename__].append(
+                    (
+                        self._next_id(SenseExample.__tablename__),
+                        sense_id,
+                        example.source,
+                        example.text,
+                        example.jpn,
+                        example.eng,
+                    )
+                )
 
-async def seed_database(batch_size: int = 1000) -> None:
-    jmdict_data = load_json_file(DICTIONARY_FILE_PATH)
-    json_words = jmdict_data["words"]
+    async def _delete_words(self, word_ids: list[int]) -> None:
+        """Delete words and all their dependent rows, children first, remembering the search keys they had."""
+        for model in (Reading, Kanji):
+            result = await self.session.execute(select(model.search_text).where(model.word_id.in_(word_ids)))
+            self.changed_keys.update(result.scalars())
 
-    print(f"Loaded {len(json_words)} word entries")
+        sense_ids = select(Sense.id).where(Sense.word_id.in_(word_ids)).scalar_subquery()
+        await self.session.execute(delete(SenseExample).where(SenseExample.sense_id.in_(sense_ids)))
+        await self.session.execute(delete(Gloss).where(Gloss.sense_id.in_(sense_ids)))
+        for model in (Sense, Reading, Kanji, WordCard):
+            await self.session.execute(delete(model).where(model.word_id.in_(word_ids)))
+        await self.session.execute(delete(Word).where(Word.id.in_(word_ids)))
 
-    async with local_session() as session:
-        result = await session.execute(select(Word).limit(1))
-        existing_word = result.scalar_one_or_none()
+    async def delete_missing(self) -> None:
+        """Remove words that are stored but no longer present in the dictionary file."""
+        missing_ids = [word_id for word_id in self.stored_hashes if word_id not in self.seen_ids]
+        # Chunked to stay well under the bind parameter limit of a single statement
+        for chunk in batched(missing_ids, COPY_BATCH_SIZE):
+            await self._delete_words(list(chunk))
+        self.sync.deleted = len(missing_ids)
+
+    async def flush(self) -> None:
+        if self.pending_replacements:
+            await self._delete_words(self.pending_replacements)
+            self.pending_replacements = []
+
+        for table, columns in COPY_COLUMNS.items():
+            records = self.records[table]
+            if not records:
+                continue
 
-        if existing_word:
-            print("Database already contains data. Skipping seed.")
+            start = time.perf_counter()
+            await self.connection.copy_records_to_table(table, records=records, columns=columns)
+            stats = self.stats[table]
+            stats.seconds += time.perf_counter() - start
+            stats.rows += len(records)
+            self.records[table] = []
+
+    async def sync_sequences(self) -> None:
+        """Move each serial sequence past the ids we handed out ourselves."""
+        for table in SERIAL_TABLES:
+            await self.connection.execute(
+                "SELECT setval(pg_get_serial_sequence($1, 'id'), $2, false)",
+                table,
+                self.next_ids[table],
+            )
+
+    async def suggestions_missing(self) -> bool:
+        return await self.session.scalar(select(WordSuggestion.prefix).limit(1)) is None
+
+    async def refresh_suggestions(self) -> None:
+        """
+        Re-rank only the prefixes of the search keys this sync added or removed: upsert their rows in
+        `word_suggestions`, and delete those of prefixes no key starts with anymore.
+        """
+        prefixes = {key[:size] for key in self.changed_keys for size in range(1, len(key) + 1)}
+        if not prefixes:
             return
 
-        print("Converting and inserting entries...")
-        words_to_insert = []
+        index = await PrefixIndex.load(self.session)
+        upsert = insert(WordSuggestion)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[WordSuggestion.prefix], set_={"word_ids": upsert.excluded.word_ids}
+        )
+
+        stats = self.stats[WordSuggestion.__tablename__]
+        rankings = index.iter_prefix_rankings(SearchWeights(), WORD_SUGGESTION_LIMIT, prefixes)
+        for chunk in batched(rankings, COPY_BATCH_SIZE):
+            start = time.perf_counter()
+            rows = [{"prefix": prefix, "word_ids": word_ids} for prefix, word_ids in chunk if word_ids]
+            if rows:
+                await self.session.execute(upsert, rows)
+            if emptied := [prefix for prefix, word_ids in chunk if not word_ids]:
+                await self.session.execute(delete(WordSuggestion).where(WordSuggestion.prefix.in_(emptied)))
+            stats.seconds += time.perf_counter() - start
+            stats.rows += len(chunk)
+
+    async def rebuild_suggestions(self) -> None:
+        """
+        Rank every prefix of every reading/kanji search key with the search weights, through the same
+        in-memory ranking the API can use, and replace the contents of `word_suggestions`.
+        """
+        index = await PrefixIndex.load(self.session)
+        await self.session.execute(delete(WordSuggestion))
+
+        stats = self.stats[WordSuggestion.__tablename__]
+        rankings = index.iter_prefix_rankings(SearchWeights(), WORD_SUGGESTION_LIMIT)
+        for chunk in batched(rankings, COPY_BATCH_SIZE):
+            start = time.perf_counter()
+            await self.connection.copy_records_to_table(
+                WordSuggestion.__tablename__, records=chunk, columns=SUGGESTION_COLUMNS
+            )
+            stats.seconds += time.perf_counter() - start
+            stats.rows += len(chunk)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.sync.inserted or self.sync.updated or self.sync.deleted)
+
+    async def bump_dataset_version(self) -> None:
+        """Signal API caches that previously computed results are stale."""
+        await self.session.execute(
+            update(DatasetVersion)
+            .where(DatasetVersion.id == DATASET_VERSION_ROW_ID)
+            .values(version=DatasetVersion.version + 1, updated_at=func.now())
+        )
+
+    def report(self) -> None:
+        print(
+            f"  {self.sync.inserted} inserted, {self.sync.updated} updated, "
+            f"{self.sync.deleted} deleted, {self.sync.unchanged} unchanged"
+        )
+        for table, stats in self.stats.items():
+            print(f"  {table:<16} {stats.rows:>9} rows in {stats.seconds:6.2f}s ({stats.rows_per_second:,.0f} rows/s)")
 
-        for i, word_json in enumerate(json_words):
-            edict_word = WordDTO.from_json(word_json)
 
-            db_word = pydantic_to_sqlalchemy(edict_word)
-            words_to_insert.append(db_word)
+def next_words(words: Iterator[WordDTO], count: int) -> list[WordDTO]:
+    return list(islice(words, count))
 
-            if len(words_to_insert) >= batch_size:
-                session.add_all(words_to_insert)
-                await session.flush()
-                print(f"Inserted {i + 1}/{len(json_words)} entries...")
-                words_to_insert = []
 
-        if words_to_insert:
-            session.add_all(words_to_insert)
-            await session.flush()
+async def seed_database(
+    batch_size: int = COPY_BATCH_SIZE, workers: int | None = None, *, rebuild_suggestions: bool = False
+) -> None:
+    async with local_session() as session:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        loader = BulkLoader(session, raw_connection.driver_connection)
+        await loader.prepare()
+
+        print(f"Syncing entries against {len(loader.stored_hashes)} stored words...")
+        start = time.perf_counter()
+        processed = 0
+
+        # Waiting on the parsing pool blocks, so batches are pulled in a thread, the next one while this one is flushed.
+        # That thread starts the pool, which is why edict spawns its workers rather than forking them
+        words = iter_words_parallel(DICTIONARY_FILE_PATH, workers=workers)
+        next_batch = asyncio.create_task(asyncio.to_thread(next_words, words, batch_size))
+        try:
+            while batch := await next_batch:
+                next_batch = asyncio.create_task(asyncio.to_thread(next_words, words, batch_size))
+                for edict_word in batch:
+                    loader.add(edict_word)
+                processed += len(batch)
+
+                await loader.flush()
+                print(f"Processed {processed} entries...")
+        finally:
+            # A pull still running in its thread cannot be cancelled: let it finish, then close the words
+            # generator so the parsing pool shuts down instead of outliving a failed load
+            await asyncio.gather(next_batch, return_exceptions=True)
+            await asyncio.to_thread(words.close)
 
+        await loader.delete_missing()
+        await loader.sync_sequences()
+        if rebuild_suggestions or await loader.suggestions_missing():
+            print("Rebuilding all suggestions...")
+            await loader.rebuild_suggestions()
+        elif loader.has_changes:
+            print(f"Refreshing suggestions of {len(loader.changed_keys)} changed search keys...")
+            await loader.refresh_suggestions()
+        if loader.has_changes or rebuild_suggestions:
+            await loader.bump_dataset_version()
         await session.commit()
-        print(f"Successfully seeded database with {len(json_words)} words!")
+
+        elapsed = time.perf_counter() - start
+        print(f"Successfully synced database with {processed} words in {elapsed:.2f}s!")
+        loader.report()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync the database with the bundled JMdict file.")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Parsing processes (default: one per CPU, 1 parses in-process)"
+    )
+    parser.add_argument("--batch-size", type=int, default=COPY_BATCH_SIZE, help="Words per COPY flush")
+    parser.add_argument(
+        "--rebuild-suggestions",
+        action="store_true",
+        help="Re-rank every prefix instead of only those of changed words (always done when there are none yet)",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
+    args = parse_args()
+    asyncio.run(
+        seed_database(batch_size=args.batch_size, workers=args.workers, rebuild_suggestions=args.rebuild_suggestions)
+    )
@@ -0,0 +1,61 @@
+import pytest
+
+from wisho.core import cache
+from wisho.core.cache import VersionedLRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+def test_evicts_least_recently_used() -> None:
+    search_cache = VersionedLRUCache(max_size=2, ttl_seconds=60, version_check_interval_seconds=5)
+    search_cache.set("a", 1)
+    search_cache.set("b", 2)
+    assert search_cache.get("a") == 1
+
+    search_cache.set("c", 3)
+    assert search_cache.get("b") is None
+    assert search_cache.get("a") == 1
+    assert search_cache.get("c") == 3
+    assert len(search_cache) == 2
+    assert (search_cache.hits, search_cache.misses) == (3, 1)
+
+
+def test_expires_entries_after_ttl(clock: FakeClock) -> None:
+    search_cache = VersionedLRUCache(max_size=10, ttl_seconds=60, version_check_interval_seconds=5)
+    search_cache.set("a", 1)
+
+    clock.now += 59
+    assert search_cache.get("a") == 1
+    clock.now += 1
+    assert search_cache.get("a") is None
+    assert len(search_cache) == 0
+
+
+def test_drops_entries_when_the_version_changes(clock: FakeClock) -> None:
+    search_cache = VersionedLRUCache(max_size=10, ttl_seconds=60, version_check_interval_seconds=5)
+    assert search_cache.version_check_due()
+    search_cache.set_version(1)
+    search_cache.set("a", 1)
+    assert not search_cache.version_check_due()
+
+    clock.now += 5
+    assert search_cache.version_check_due()
+    search_cache.set_version(1)
+    assert search_cache.get("a") == 1
+
+    search_cache.set_version(2)
+    assert search_cache.version == 2
+    assert search_cache.get("a") is None
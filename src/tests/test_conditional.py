@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from wisho.api import router
+from wisho.api.conditional import etag_matches
+from wisho.api.dependencies import SEARCH_VARIANT_HEADER, get_search_controller, get_search_weights
+from wisho.controllers.search import SearchController
+from wisho.core.cache import VersionedLRUCache
+from wisho.core.pagination import SearchCursor
+from wisho.core.setup import create_application
+from wisho.repositories.word import SearchWeights, WordRepository
+
+ETAG = '"abc"'
+
+
+class CallRecordingWordRepository(WordRepository):
+    """Repository serving one word card and one suggestion, recording the statements it would run."""
+
+    def __init__(self, weights: SearchWeights | None = None) -> None:
+        super().__init__(session=None, weights=weights)  # type: ignore[arg-type]
+        self.calls: list[str] = []
+
+    async def get_dataset_version(self) -> int:
+        self.calls.append("version")
+        return 1
+
+    async def search_word_cards(
+        self, _query: str, _limit: int = 20, _after: SearchCursor | None = None
+    ) -> list[tuple[int, float, str]]:
+        self.calls.append("cards")
+        return [(1, 5.0, '{"id":1}')]
+
+    async def suggest_word_cards(self, _query: str, _limit: int) -> list[str]:
+        self.calls.append("suggestions")
+        return ['{"id":1}']
+
+
+def vary(response: Response) -> set[str]:
+    return {name.strip() for name in response.headers["Vary"].split(",")}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = create_application(router)
+    app.state.search_weight_variants = {"flat": SearchWeights(common_weight=0.0)}
+    cache = VersionedLRUCache(max_size=10, ttl_seconds=60, version_check_interval_seconds=60)
+
+    def controller(weights: SearchWeights | None = Depends(get_search_weights)) -> SearchController:  # noqa: B008
+        return SearchController(CallRecordingWordRepository(weights), cache)
+
+    app.dependency_overrides[get_search_controller] = controller
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "matches"),
+    [
+        (None, False),
+        ("", False),
+        (ETAG, True),
+        (f"W/{ETAG}", True),
+        (f'"other", {ETAG}', True),
+        (f' W/"other" ,W/{ETAG} ', True),
+        ("*", True),
+        ('"other"', False),
+        ('"abc', False),
+    ],
+)
+def test_matches_if_none_match_weakly(if_none_match: str | None, matches: bool) -> None:  # noqa: FBT001
+    assert etag_matches(if_none_match, ETAG) is matches
+
+
+@pytest.mark.parametrize(("path", "query"), [("/api/v1/search", "eat"), ("/api/v1/suggest", "tab")])
+def test_answers_revalidations_with_304(client: TestClient, path: str, query: str) -> None:
+    response = client.get(path, params={"q": query})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('"')
+    assert etag.endswith('"')
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert SEARCH_VARIANT_HEADER in vary(response)
+
+    for if_none_match in (etag, f"W/{etag}", "*"):
+        revalidated = client.get(path, params={"q": query}, headers={"If-None-Match": if_none_match})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["ETag"] == etag
+        assert vary(revalidated) == vary(response)
+
+    stale = client.get(path, params={"q": query}, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.headers["ETag"] == etag
+
+
+def test_tags_differ_by_query_page_and_variant(client: TestClient) -> None:
+    def etag(params: dict[str, str], headers: dict[str, str] | None = None) -> str:
+        return client.get("/api/v1/search", params=params, headers=headers).headers["ETag"]
+
+    default = etag({"q": "eat"})
+    assert etag({"q": "eat"}) == default
+    assert etag({"q": "drink"}) != default
+    assert etag({"q": "eat", "limit": "5"}) != default
+    assert etag({"q": "eat"}, {SEARCH_VARIANT_HEADER: "flat"}) != default
+    # Unknown variants rank with the default weights
+    assert etag({"q": "eat"}, {SEARCH_VARIANT_HEADER: "unknown"}) == default
+
+
+def test_reads_the_dataset_version_periodically_without_a_result_cache() -> None:
+    repository = CallRecordingWordRepository()
+    controller = SearchController(repository, VersionedLRUCache(0, 60, 60))
+
+    async def serve(query: str) -> None:
+        await controller.search_etag(query)
+        await controller.search_json(query)
+
+    async def run() -> None:
+        await serve("eat")
+        await serve("eat")
+
+    asyncio.run(run())
+    # One version read for both requests, and nothing cached: each search still runs its single statement
+    assert repository.calls == ["version", "cards", "cards"]
@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import SecretStr
+
+from wisho.api import router
+from wisho.api.dependencies import get_slow_query_log
+from wisho.core.config import Settings, get_settings
+from wisho.core.setup import create_application
+
+DEBUG_TOKEN = "s3cret"  # noqa: S105
+SLOW_QUERIES_PATH = "/api/v1/debug/slow-queries"
+
+
+class FakeSlowQueryLog:
+    def __init__(self) -> None:
+        self.cleared = False
+
+    def entries(self) -> list:
+        return []
+
+    def clear(self) -> None:
+        self.cleared = True
+
+
+def client_for(log: FakeSlowQueryLog, debug_token: str | None) -> TestClient:
+    app = create_application(router)
+    settings = Settings(debug_token=SecretStr(debug_token) if debug_token else None)
+    app.dependency_overrides[get_settings] = lambda: settings
+    app.dependency_overrides[get_slow_query_log] = lambda: log
+    return TestClient(app)
+
+
+def test_hides_debug_endpoints_without_a_configured_token() -> None:
+    client = client_for(FakeSlowQueryLog(), debug_token=None)
+    headers = {"Authorization": "Bearer anything"}
+    assert client.get(SLOW_QUERIES_PATH, headers=headers).status_code == 404
+    assert client.delete(SLOW_QUERIES_PATH, headers=headers).status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}, {"Authorization": f"Basic {DEBUG_TOKEN}"}])
+def test_rejects_requests_without_the_debug_token(headers: dict[str, str]) -> None:
+    log = FakeSlowQueryLog()
+    client = client_for(log, DEBUG_TOKEN)
+    assert client.get(SLOW_QUERIES_PATH, headers=headers).status_code == 401
+    assert client.delete(SLOW_QUERIES_PATH, headers=headers).status_code == 401
+    assert not log.cleared
+
+
+def test_serves_debug_endpoints_with_the_debug_token() -> None:
+    log = FakeSlowQueryLog()
+    client = client_for(log, DEBUG_TOKEN)
+    headers = {"Authorization": f"Bearer {DEBUG_TOKEN}"}
+    assert client.get(SLOW_QUERIES_PATH, headers=headers).json() == []
+    assert client.delete(SLOW_QUERIES_PATH, headers=headers).status_code == 204
+    assert log.cleared
@@ -0,0 +1,133 @@
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Float, Integer, MetaData, Table, create_engine, select
+
+from wisho.api import router
+from wisho.api.dependencies import get_search_controller
+from wisho.controllers.search import SearchController
+from wisho.core.pagination import NEXT_CURSOR_HEADER, SearchCursor, decode_cursor, encode_cursor
+from wisho.core.setup import create_application
+from wisho.errors.pagination import InvalidCursorError
+from wisho.repositories.word import WordRepository
+
+# (word_id, score) in ranking order, with ties on score broken by word id
+RANKING = [(7, 9.5), (2, 7.0), (3, 7.0), (9, 7.0), (1, 4.25), (4, 4.25), (8, 1.0)]
+
+
+def token(raw: str | bytes) -> str:
+    data = raw.encode() if isinstance(raw, str) else raw
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def page(rows: list[tuple[int, float]], limit: int, after: SearchCursor | None) -> list[tuple[int, float]]:
+    """The keyset page of a ranking, as the ranking queries and the prefix index compute it."""
+    if after is not None:
+        rows = [row for row in rows if (-row[1], row[0]) > (-after.score, after.word_id)]
+    return rows[:limit]
+
+
+class RankedWordRepository(WordRepository):
+    """Repository serving a fixed ranking as word cards."""
+
+    def __init__(self) -> None:
+        super().__init__(session=None)  # type: ignore[arg-type]
+
+    async def get_dataset_version(self) -> int:
+        return 1
+
+    async def search_word_cards(
+        self, _query: str, limit: int = 20, after: SearchCursor | None = None
+    ) -> list[tuple[int, float, str]]:
+        return [(word_id, score, f'{{"id":{word_id}}}') for word_id, score in page(RANKING, limit, after)]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = create_application(router)
+    app.dependency_overrides[get_search_controller] = lambda: SearchController(RankedWordRepository())
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("cursor", [SearchCursor(7.0, 3), SearchCursor(0.0, 0), SearchCursor(-1.5, 2**31 - 1)])
+def test_round_trips_cursors(cursor: SearchCursor) -> None:
+    encoded = encode_cursor(cursor)
+    assert "=" not in encoded
+    assert decode_cursor(encoded) == cursor
+
+
+@pytest.mark.parametrize(
+    "bad_token",
+    [
+        "",
+        "not a cursor!",
+        token(b"\xff\xfe"),
+        token("{}"),
+        token("[1.5]"),
+        token("[1.5, 2, 3]"),
+        token('["7.0", 3]'),
+        token("[7.0, 3.5]"),
+        token("[true, 3]"),
+        token("[7.0, false]"),
+        token("[NaN, 3]"),
+        token("[1e999, 3]"),
+        token(f"[1{'0' * 400}, 3]"),
+        token("[7.0, -1]"),
+        token(f"[7.0, {2**31}]"),
+    ],
+)
+def test_rejects_malformed_cursors(bad_token: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(bad_token)
+
+
+def test_answers_bad_cursors_with_400(client: TestClient) -> None:
+    response = client.get("/api/v1/search", params={"q": "eat", "cursor": token("[NaN, 3]")})
+    assert response.status_code == 400
+
+
+def test_pages_through_ties_without_gaps_or_repeats(client: TestClient) -> None:
+    seen: list[int] = []
+    params = {"q": "eat", "limit": "2"}
+    while True:
+        response = client.get("/api/v1/search", params=params)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+    assert seen == [word_id for word_id, _ in RANKING]
+
+
+def test_exposes_the_cursor_to_browsers(client: TestClient) -> None:
+    response = client.get(
+        "/api/v1/search", params={"q": "eat", "limit": "2"}, headers={"Origin": "http://localhost:3000"}
+    )
+    assert NEXT_CURSOR_HEADER in response.headers
+    exposed = {name.strip().lower() for name in response.headers["Access-Control-Expose-Headers"].split(",")}
+    assert {NEXT_CURSOR_HEADER.lower(), "etag"} <= exposed
+
+
+@pytest.mark.parametrize("after", [None, *(SearchCursor(score, word_id) for word_id, score in RANKING)])
+def test_ranked_page_breaks_score_ties_by_word_id(after: SearchCursor | None) -> None:
+    metadata = MetaData()
+    ranking = Table("ranking", metadata, Column("word_id", Integer), Column("score", Float))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+
+    stmt = WordRepository._ranked_page(  # noqa: SLF001
+        select(ranking.c.word_id, ranking.c.score).order_by(ranking.c.score.desc(), ranking.c.word_id),
+        paged=after is not None,
+    )
+    params = {"limit": 3}
+    if after is not None:
+        params |= {"after_score": after.score, "after_word_id": after.word_id}
+
+    with engine.connect() as connection:
+        # Inserted out of order, so only the ranking query's ORDER BY and keyset condition can get it right
+        connection.execute(ranking.insert(), [{"word_id": w, "score": s} for w, s in sorted(RANKING)])
+        rows = [tuple(row) for row in connection.execute(stmt, params)]
+
+    assert rows == page(RANKING, 3, after)
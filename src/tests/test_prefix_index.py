@@ -0,0 +1,101 @@
+import pytest
+
+from wisho.core.pagination import SearchCursor
+from wisho.repositories.prefix_index import KANJI_KIND, READING_KIND, PrefixIndex
+from wisho.repositories.word import SearchWeights
+
+# Forms as `PrefixIndex` takes them: search_text, word_id, length, kind and common flag
+FORMS = [
+    ("たべる", 1, 3, READING_KIND, True),
+    ("食べる", 1, 3, KANJI_KIND, True),
+    ("たべもの", 2, 4, READING_KIND, False),
+    ("た", 3, 1, READING_KIND, True),
+    ("田", 3, 1, KANJI_KIND, False),
+    ("たべ", 4, 2, READING_KIND, False),
+    ("たべない", 4, 4, READING_KIND, False),
+    ("のむ", 5, 2, READING_KIND, False),
+    ("たべもの", 6, 4, READING_KIND, False),
+    ("おちゃ", 7, 3, READING_KIND, True),
+    ("お茶", 7, 2, KANJI_KIND, True),
+    ("お", 8, 1, READING_KIND, False),
+]
+
+# Expected scores, worked out from the SQL ranking with the default weights:
+# per kind, base + exact bonus (if a form equals the query) + length_weight / (1 + shortest form length),
+# summed over kinds, plus the common bonus once per word. Single-character queries scale the base
+# by 0.5, the exact bonus by 1.75 and the length weight by 1.25.
+MULTI_CHAR_SCORES = {
+    4: 5.0 + 6.0 + 2.0 / 3,
+    1: 5.0 + 2.0 / 4 + 1.0,
+    2: 5.0 + 2.0 / 5,
+    6: 5.0 + 2.0 / 5,
+}
+SINGLE_CHAR_SCORES = {
+    8: 2.5 + 10.5 + 2.5 / 2,
+    7: (2.5 + 2.5 / 4) + (2.5 + 2.5 / 3) + 1.0,
+}
+
+
+@pytest.fixture
+def index() -> PrefixIndex:
+    return PrefixIndex(list(FORMS))
+
+
+def scores(rows: list[dict[str, int | float]]) -> dict[int, float]:
+    return {int(row["word_id"]): row["score"] for row in rows}
+
+
+def test_scores_like_sql(index: PrefixIndex) -> None:
+    weights = SearchWeights()
+    assert scores(index.rank("たべ", weights, 10)) == pytest.approx(MULTI_CHAR_SCORES)
+    assert scores(index.rank("お", weights, 10)) == pytest.approx(SINGLE_CHAR_SCORES)
+    assert index.rank("ぬ", weights, 10) == []
+
+
+def test_orders_by_score_then_word_id(index: PrefixIndex) -> None:
+    ranked = index.rank("たべ", SearchWeights(), 10)
+    # Words 2 and 6 tie on score: the lower id comes first
+    assert [row["word_id"] for row in ranked] == [4, 1, 2, 6]
+    assert [row["word_id"] for row in index.rank("たべ", SearchWeights(), 2)] == [4, 1]
+
+
+def test_filters_by_cursor(index: PrefixIndex) -> None:
+    weights = SearchWeights()
+    ranked = index.rank("たべ", weights, 10)
+
+    after_second = SearchCursor(ranked[1]["score"], ranked[1]["word_id"])
+    assert [row["word_id"] for row in index.rank("たべ", weights, 10, after_second)] == [2, 6]
+
+    # Within a score tie, the cursor's word id decides where the page starts
+    after_tie = SearchCursor(ranked[2]["score"], ranked[2]["word_id"])
+    assert [row["word_id"] for row in index.rank("たべ", weights, 10, after_tie)] == [6]
+
+    after_last = SearchCursor(ranked[-1]["score"], ranked[-1]["word_id"])
+    assert index.rank("たべ", weights, 10, after_last) == []
+
+
+def test_memoizes_single_char_queries(index: PrefixIndex) -> None:
+    weights = SearchWeights()
+    first = index.rank("お", weights, 10)
+    assert index.rank("お", weights, 10) is first
+    assert (index.memo_hits, index.memo_misses) == (1, 1)
+
+    # Other limits, weights and cursors are ranked separately
+    index.rank("お", weights, 1)
+    index.rank("お", SearchWeights(common_weight=0.0), 10)
+    index.rank("お", weights, 10, SearchCursor(first[0]["score"], first[0]["word_id"]))
+    assert (index.memo_hits, index.memo_misses) == (1, 4)
+
+    index.rank("たべ", weights, 10)
+    assert (index.memo_hits, index.memo_misses) == (1, 4)
+
+
+def test_ranks_only_the_given_prefixes(index: PrefixIndex) -> None:
+    weights = SearchWeights()
+    every_prefix = dict(index.iter_prefix_rankings(weights, 3))
+    assert every_prefix["たべ"] == [4, 1, 2]
+    assert len(every_prefix) == len({key[:size] for key, *_ in FORMS for size in range(1, len(key) + 1)})
+
+    # A prefix no key starts with anymore yields an empty list, so its stored suggestions can be dropped
+    refreshed = list(index.iter_prefix_rankings(weights, 3, {"のむ", "たべ", "ぬ"}))
+    assert refreshed == [("たべ", every_prefix["たべ"]), ("ぬ", []), ("のむ", every_prefix["のむ"])]
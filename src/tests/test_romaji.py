@@ -0,0 +1,55 @@
+import pytest
+
+from wisho.core.romaji import kana_to_romaji, romaji_kana_prefixes, romaji_search_key
+
+
+@pytest.mark.parametrize(
+    ("kana", "romaji"),
+    [
+        ("しんぶん", "shinbun"),
+        ("まっちゃ", "maccha"),
+        ("ラーメン", "raamen"),
+        ("ーー", ""),
+        ("をかし", "okashi"),
+    ],
+)
+def test_spells_kana_as_stored_romaji(kana: str, romaji: str) -> None:
+    assert kana_to_romaji(kana) == romaji
+
+
+@pytest.mark.parametrize(
+    ("query", "key"),
+    [
+        ("shinbun", "shinbun"),
+        ("tu", "tsu"),
+        ("matcha", "maccha"),
+        # Hepburn "m" for ん before b, m and p
+        ("shimbun", "shinbun"),
+        ("sampo", "sanpo"),
+        ("sammai", "sanmai"),
+        ("kimono", "kimono"),
+        # "wo" is the particle を, stored as "o"
+        ("wo", "o"),
+        ("wotaku", "otaku"),
+        # Unfinished trailing syllables are kept for prefix matching
+        ("tab", "tab"),
+        ("eat", "eat"),
+        ("xyz", None),
+        ("食べ", None),
+    ],
+)
+def test_reads_queries_as_romaji(query: str, key: str | None) -> None:
+    assert romaji_search_key(query) == key
+
+
+def test_reads_unfinished_romaji_as_kana_prefixes() -> None:
+    assert romaji_kana_prefixes("taberu") == ["たべる"]
+    # A trailing "n" may be ん or the start of な, に...
+    assert {"しんぶん", "しんぶな"} <= set(romaji_kana_prefixes("shimbun"))
+    assert romaji_kana_prefixes("wo") == ["を"]
+    assert romaji_kana_prefixes("kon'nichiwa") == ["こんにちわ"]
+    assert {"たば", "たべ", "たびゃ"} <= set(romaji_kana_prefixes("tab"))
+    assert {"しん", "しま"} <= set(romaji_kana_prefixes("shim"))
+    assert {"たっか", "たっきょ"} <= set(romaji_kana_prefixes("takk"))
+    assert "まっ" in romaji_kana_prefixes("mat")
+    assert romaji_kana_prefixes("xyz") == []
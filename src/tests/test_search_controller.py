@@ -0,0 +1,47 @@
+import asyncio
+
+from wisho.controllers.search import SearchController
+from wisho.core.cache import VersionedLRUCache
+from wisho.core.pagination import SearchCursor
+from wisho.repositories.word import WordRepository
+
+FULL_WIDTH_EAT = "\uff45\uff41\uff54"
+
+
+class RecordingWordRepository(WordRepository):
+    """Repository that ranks nothing, but records the queries it is asked to rank."""
+
+    def __init__(self) -> None:
+        super().__init__(session=None)  # type: ignore[arg-type]
+        self.ranked: list[str] = []
+
+    async def get_dataset_version(self) -> int:
+        return 1
+
+    async def search_word_cards(
+        self, query: str, _limit: int = 20, _after: SearchCursor | None = None
+    ) -> list[tuple[int, float, str]]:
+        self.ranked.append(query)
+        return []
+
+
+def search(controller: SearchController, *queries: str) -> None:
+    async def run() -> None:
+        for query in queries:
+            await controller.search_json(query)
+
+    asyncio.run(run())
+
+
+def test_caches_queries_by_what_is_ranked() -> None:
+    repository = RecordingWordRepository()
+    controller = SearchController(repository, VersionedLRUCache(10, 60, 5))
+
+    # English ranks the raw query, so full-width and ASCII spellings are different searches
+    search(controller, FULL_WIDTH_EAT, "eat", "eat")
+    assert repository.ranked == [FULL_WIDTH_EAT, "eat"]
+
+    # Japanese ranks the folded search key, shared by katakana and hiragana
+    repository.ranked.clear()
+    search(controller, "たべ", "タベ")
+    assert repository.ranked == ["たべ"]
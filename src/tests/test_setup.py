@@ -0,0 +1,49 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import pytest
+from starlette.datastructures import State
+
+from wisho.core import setup
+from wisho.repositories.prefix_index import READING_KIND, PrefixIndex
+
+
+class VersionSession:
+    def __init__(self, version: int) -> None:
+        self.version = version
+
+    async def scalar(self, _stmt: object) -> int:
+        return self.version
+
+
+def test_reloads_the_prefix_index_when_the_dataset_version_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = VersionSession(version=1)
+    loaded = PrefixIndex([("たべる", 1, 3, READING_KIND, True)], dataset_version=2)
+
+    @asynccontextmanager
+    async def local_session() -> AsyncIterator[VersionSession]:
+        yield session
+
+    async def load(_session: VersionSession) -> PrefixIndex:
+        return loaded
+
+    monkeypatch.setattr(setup, "local_session", local_session)
+    monkeypatch.setattr(PrefixIndex, "load", load)
+
+    state = State()
+    state.prefix_index = PrefixIndex([], dataset_version=1)
+    state.prefix_index.memo_hits = 3
+
+    async def run() -> None:
+        task = asyncio.create_task(setup.reload_prefix_index(state, interval_seconds=0))
+        await asyncio.sleep(0.01)
+        assert state.prefix_index.dataset_version == 1
+
+        session.version = 2
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(run())
+    assert state.prefix_index is loaded
+    assert state.prefix_index.memo_hits == 3
@@ -0,0 +1,139 @@
+import asyncio
+from collections.abc import Iterator
+from contextlib import nullcontext
+from typing import Any, NamedTuple
+
+import pytest
+from sqlalchemy import Select
+
+from wisho.repositories import word
+from wisho.repositories.prefix_index import READING_KIND, PrefixIndex
+from wisho.repositories.word import BATCH_QUERY_CLASS, WordRepository
+
+
+class CardRow(NamedTuple):
+    word_id: int
+    readings: list[str]
+    kanji: list[str]
+    glosses: list[str]
+
+
+class FakeResult:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.rows)
+
+    def tuples(self) -> "FakeResult":
+        return self
+
+    def all(self) -> list[tuple]:
+        return self.rows
+
+    def scalars(self) -> Iterator:
+        return (row[0] for row in self.rows)
+
+
+class FakeCardSession:
+    """Stands in for the database behind the prefix index: it only answers lookups of word cards by id."""
+
+    def __init__(self, cards: dict[int, CardRow]) -> None:
+        self.cards = cards
+
+    async def execute(self, stmt: Select, params: dict[str, Any]) -> FakeResult:
+        cards = [self.cards[word_id] for word_id in params["word_ids"] if word_id in self.cards]
+        if "payload" in stmt.selected_columns:
+            return FakeResult([(card.word_id, f'{{"id":{card.word_id}}}') for card in cards])
+        return FakeResult(cards)
+
+
+class FakeSuggestionSession:
+    """Stands in for `word_suggestions` (ranked word ids per search key prefix) read like `_build_suggestions_query`."""
+
+    def __init__(self, suggestions: dict[str, list[int]]) -> None:
+        self.suggestions = suggestions
+        self.prefixes: list[str] = []
+
+    async def execute(self, _stmt: Select, params: dict[str, Any]) -> FakeResult:
+        self.prefixes = params["prefixes"]
+        best: dict[int, tuple[int, int]] = {}
+        for position, prefix in enumerate(self.prefixes):
+            for idx, word_id in enumerate(self.suggestions.get(prefix, [])):
+                best[word_id] = min(best.get(word_id, (idx, position)), (idx, position))
+        ranked = sorted((rank, word_id) for word_id, rank in best.items())
+        return FakeResult([(f'{{"id":{word_id}}}',) for _, word_id in ranked[: params["limit"]]])
+
+
+@pytest.fixture
+def repository() -> WordRepository:
+    # Word 2 was deleted by a reseed after the index was loaded
+    index = PrefixIndex([("たべる", 1, 3, READING_KIND, True), ("たべもの", 2, 4, READING_KIND, False)])
+    session = FakeCardSession({1: CardRow(1, ["たべる"], ["食べる"], ["to eat"])})
+    return WordRepository(session, prefix_index=index)  # type: ignore[arg-type]
+
+
+def test_batch_search_drops_ranked_words_without_a_card(repository: WordRepository) -> None:
+    results = asyncio.run(repository.search_words_batch(["たべ", "たべも", "タベ"]))
+    assert [[word["word_id"] for word in words] for words in results] == [[1], [], [1]]
+
+
+def test_batch_search_times_every_stage_as_batch(repository: WordRepository, monkeypatch: pytest.MonkeyPatch) -> None:
+    timed: list[tuple[str, ...]] = []
+
+    class RecordingHistogram:
+        def time(self, *label_values: str) -> nullcontext:
+            timed.append(label_values)
+            return nullcontext()
+
+    monkeypatch.setattr(word, "SEARCH_STAGE_SECONDS", RecordingHistogram())
+    asyncio.run(repository.search_words_batch(["たべ", "タベ"]))
+    assert timed
+    assert {query_class for _, query_class in timed} == {BATCH_QUERY_CLASS}
+
+
+def test_word_cards_drop_ranked_words_without_a_card(repository: WordRepository) -> None:
+    cards = asyncio.run(repository.search_word_cards("たべ"))
+    assert [(word_id, payload) for word_id, _, payload in cards] == [(1, '{"id":1}')]
+
+
+@pytest.mark.parametrize(
+    ("query", "payloads"),
+    [
+        ("taberu", ['{"id":1}']),
+        # Mid-syllable, the "b" may become any of ば, び, ぶ, べ, ぼ
+        ("tab", ['{"id":5}', '{"id":1}', '{"id":2}']),
+        ("tabe", ['{"id":1}', '{"id":2}']),
+        # 今日 (word 1) reads both きょう and こんにち: it comes back once, at its best rank
+        ("k", ['{"id":4}', '{"id":1}', '{"id":6}']),
+        ("xyz", []),
+    ],
+)
+def test_suggests_words_for_romaji_being_typed(query: str, payloads: list[str]) -> None:
+    session = FakeSuggestionSession({"たべ": [1, 2], "たべる": [1], "たば": [5], "か": [4], "き": [1, 6], "こ": [1]})
+    repository = WordRepository(session)  # type: ignore[arg-type]
+    assert asyncio.run(repository.suggest_word_cards(query, 10)) == payloads
+
+
+def test_suggests_under_the_shortest_covering_prefixes() -> None:
+    session = FakeSuggestionSession({})
+    asyncio.run(WordRepository(session).suggest_word_cards("sh", 10))  # type: ignore[arg-type]
+    # しゃ, しゅ, しょ and しぇ are all under し
+    assert session.prefixes == ["し"]
+
+
+def test_slow_query_log_records_failed_statements() -> None:
+    observed: list[str | None] = []
+
+    class TimedOutSession:
+        async def execute(self, _stmt: Select, _params: dict[str, Any]) -> FakeResult:
+            raise TimeoutError
+
+    class RecordingLog:
+        def observe(self, query: str | None, *_: object) -> None:
+            observed.append(query)
+
+    repository = WordRepository(TimedOutSession(), slow_query_log=RecordingLog())  # type: ignore[arg-type]
+    with pytest.raises(TimeoutError):
+        asyncio.run(repository.search_word_cards("eat"))
+    assert observed == ["eat"]
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
+from wisho.api.metrics import router as metrics_router
 from wisho.api.v1 import router as v1_router
 
-router = APIRouter(prefix="/api")
-router.include_router(v1_router)
+router = APIRouter()
+router.include_router(v1_router, prefix="/api")
+router.include_router(metrics_router)
@@ -0,0 +1,26 @@
+from fastapi import Response, status
+
+from wisho.api.dependencies import SEARCH_VARIANT_HEADER
+from wisho.core.config import get_settings
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header covers `etag`, using the weak comparison RFC 9110 prescribes for it."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """
+    Validator and freshness headers of a cacheable response. Bodies depend on the ranking
+    variant header too, so shared caches must key on it.
+    """
+    max_age = get_settings().search_response_max_age_seconds
+    return {"ETag": etag, "Cache-Control": f"public, max-age={max_age}", "Vary": SEARCH_VARIANT_HEADER}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
@@ -0,0 +1,41 @@
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from wisho.controllers.search import SearchController
+from wisho.core.cache import VersionedLRUCache
+from wisho.core.db.session import get_async_session
+from wisho.core.slow_queries import SlowQueryLog
+from wisho.repositories.prefix_index import PrefixIndex
+from wisho.repositories.word import SearchWeights, WordRepository
+
+# Selects one of the configured `search_weight_variants` for the request
+SEARCH_VARIANT_HEADER = "X-Search-Variant"
+
+
+def get_prefix_index(request: Request) -> PrefixIndex | None:
+    return request.app.state.prefix_index
+
+
+def get_search_cache(request: Request) -> VersionedLRUCache | None:
+    return request.app.state.search_cache
+
+
+def get_slow_query_log(request: Request) -> SlowQueryLog | None:
+    return request.app.state.slow_query_log
+
+
+def get_search_weights(request: Request) -> SearchWeights | None:
+    """Weights of the variant named by the request's variant header; unknown or missing variants use the defaults."""
+    variant = request.headers.get(SEARCH_VARIANT_HEADER)
+    return request.app.state.search_weight_variants.get(variant) if variant else None
+
+
+def get_search_controller(
+    session: AsyncSession = Depends(get_async_session),  # noqa: B008
+    prefix_index: PrefixIndex | None = Depends(get_prefix_index),  # noqa: B008
+    search_cache: VersionedLRUCache | None = Depends(get_search_cache),  # noqa: B008
+    weights: SearchWeights | None = Depends(get_search_weights),  # noqa: B008
+    slow_query_log: SlowQueryLog | None = Depends(get_slow_query_log),  # noqa: B008
+) -> SearchController:
+    repository = WordRepository(session, weights=weights, prefix_index=prefix_index, slow_query_log=slow_query_log)
+    return SearchController(repository, search_cache)
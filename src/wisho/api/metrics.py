@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from wisho.core.metrics import METRICS_CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
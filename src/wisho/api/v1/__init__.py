@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from wisho.api.v1.debug import router as debug_router
 from wisho.api.v1.search import router as search_router
+from wisho.api.v1.suggest import router as suggest_router
 
 router = APIRouter(prefix="/v1")
 router.include_router(search_router)
+router.include_router(suggest_router)
+router.include_router(debug_router)
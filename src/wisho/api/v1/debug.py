@@ -0,0 +1,64 @@
+import secrets
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel, Field
+
+from wisho.api.dependencies import get_slow_query_log
+from wisho.core.config import Settings, get_settings
+from wisho.core.slow_queries import SlowQueryLog
+
+bearer = HTTPBearer(auto_error=False)
+
+
+def require_debug_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),  # noqa: B008
+    settings: Settings = Depends(get_settings),  # noqa: B008
+) -> None:
+    """Let through only requests bearing the configured debug token; without one, the endpoints do not exist."""
+    if settings.debug_token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    expected = settings.debug_token.get_secret_value().encode()
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing debug token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_debug_token)])
+
+
+class GetSlowQuery(BaseModel):
+    query: str | None = Field(None, description="Search query the statement served, if it served a single one")
+    statement: str = Field(..., description="SQL statement, with bind parameter placeholders")
+    params: dict[str, Any] = Field(..., description="Bind parameters of the statement")
+    duration_ms: float = Field(..., description="Execution time in milliseconds")
+    recorded_at: datetime = Field(..., description="When the statement completed")
+    plan: str | None = Field(None, description="EXPLAIN (ANALYZE, BUFFERS) output, if this statement was sampled")
+
+
+def require_slow_query_log(
+    slow_query_log: SlowQueryLog | None = Depends(get_slow_query_log),  # noqa: B008
+) -> SlowQueryLog:
+    if slow_query_log is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slow query logging is disabled")
+    return slow_query_log
+
+
+@router.get("/slow-queries", response_model=list[GetSlowQuery])
+async def get_slow_queries(
+    slow_query_log: SlowQueryLog = Depends(require_slow_query_log),  # noqa: B008
+) -> list[GetSlowQuery]:
+    """Most recent statements above the slow query threshold, newest first."""
+    return [GetSlowQuery.model_validate(entry, from_attributes=True) for entry in slow_query_log.entries()]
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(
+    slow_query_log: SlowQueryLog = Depends(require_slow_query_log),  # noqa: B008
+) -> None:
+    slow_query_log.clear()
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, Query
-from pydantic import BaseModel, Field
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated
 
-from wisho.controllers.search import SearchController
-from wisho.core.db.session import get_async_session
-from wisho.repositories.word import WordRepository
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from pydantic import BaseModel, Field, TypeAdapter
+
+from wisho.api.conditional import cache_headers, etag_matches, not_modified
+from wisho.api.dependencies import get_search_controller
+from wisho.controllers.search import BATCH_QUERY_CLASS, SearchController
+from wisho.core.metrics import SEARCH_STAGE_SECONDS, VALIDATE_STAGE
+from wisho.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from wisho.errors.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -17,13 +21,70 @@ class GetSearchResults(BaseModel):
     score: float = Field(..., description="Computed search relevance score")
 
 
-@router.get("", response_model=list[GetSearchResults])
+class PostSearchBatch(BaseModel):
+    queries: list[Annotated[str, Field(min_length=1)]] = Field(
+        ..., min_length=1, max_length=1000, description="Search query strings"
+    )
+    limit: int = Field(20, ge=1, le=100, description="Maximum number of results per query")
+
+
+class PostSearchBatchResults(BaseModel):
+    query: str = Field(..., description="Query string, as sent")
+    results: list[GetSearchResults] = Field(default_factory=list, description="Results for this query")
+
+
+SEARCH_BATCH_RESULTS_ADAPTER = TypeAdapter(list[PostSearchBatchResults])
+
+
+@router.get(
+    "",
+    response_model=list[GetSearchResults],
+    responses={
+        200: {
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Opaque cursor of the next page, absent on the last page",
+                    "schema": {"type": "string"},
+                }
+            }
+        }
+    },
+)
 async def search_entries(
     q: str = Query(..., min_length=1, description="Search query string"),
     limit: int = Query(20, ge=1, le=100),
-    session: AsyncSession = Depends(get_async_session),  # noqa: B008
-) -> list[GetSearchResults]:
-    repository = WordRepository(session)
-    controller = SearchController(repository)
+    cursor: str | None = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    controller: SearchController = Depends(get_search_controller),  # noqa: B008
+    if_none_match: str | None = Header(None),
+) -> Response:
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    # The tag is known before the page is computed, so a revalidation costs no search at all
+    etag = await controller.search_etag(q, limit, after)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    # The body is assembled from the stored word card JSON; `response_model` only documents its shape
+    body, next_cursor = await controller.search_json(q, limit, after)
+    headers = cache_headers(etag)
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(next_cursor)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
-    return await controller.search(q, limit)
+@router.post("/batch", response_model=list[PostSearchBatchResults])
+async def search_entries_batch(
+    body: PostSearchBatch,
+    controller: SearchController = Depends(get_search_controller),  # noqa: B008
+) -> Response:
+    results = await controller.search_batch(body.queries, body.limit)
+    # Validated and serialized here rather than by FastAPI, so the stage can be timed
+    with SEARCH_STAGE_SECONDS.time(VALIDATE_STAGE, BATCH_QUERY_CLASS):
+        validated = SEARCH_BATCH_RESULTS_ADAPTER.validate_python(
+            [{"query": query, "results": found} for query, found in zip(body.queries, results, strict=True)]
+        )
+        content = SEARCH_BATCH_RESULTS_ADAPTER.dump_json(validated)
+    return Response(content=content, media_type="application/json")
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Header, Query, Response
+from pydantic import BaseModel, Field
+
+from wisho.api.conditional import cache_headers, etag_matches, not_modified
+from wisho.api.dependencies import get_search_controller
+from wisho.controllers.search import SearchController
+from wisho.models.jmdict import WORD_SUGGESTION_LIMIT
+
+router = APIRouter(prefix="/suggest", tags=["suggest"])
+
+
+class GetSuggestResults(BaseModel):
+    id: int = Field(..., description="Internal word ID")
+    kanjis: list[str] = Field(default_factory=list, description="Kanji forms of the word")
+    readings: list[str] = Field(default_factory=list, description="Kana readings")
+    glosses: list[str] = Field(default_factory=list, description="English (or translated) glosses")
+
+
+@router.get("", response_model=list[GetSuggestResults])
+async def suggest_entries(
+    q: str = Query(..., min_length=1, description="Partial query, as typed"),
+    limit: int = Query(WORD_SUGGESTION_LIMIT, ge=1, le=WORD_SUGGESTION_LIMIT),
+    controller: SearchController = Depends(get_search_controller),  # noqa: B008
+    if_none_match: str | None = Header(None),
+) -> Response:
+    etag = await controller.suggest_etag(q, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    # Suggestions are read precomputed per prefix; `response_model` only documents their shape
+    body = await controller.suggest_json(q, limit)
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
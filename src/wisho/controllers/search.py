@@ -1,30 +1,148 @@
-from wisho.repositories.word import WordRepository
+import hashlib
+from collections.abc import Hashable
+
+from wisho.core.cache import VersionedLRUCache
+from wisho.core.helpers import nfkc
+from wisho.core.metrics import ASSEMBLE_STAGE, SEARCH_STAGE_SECONDS, TOTAL_STAGE
+from wisho.core.pagination import SearchCursor
+from wisho.repositories.word import BATCH_QUERY_CLASS, RankedWordDetails, WordRepository
+
+# Cache key namespaces, so dict results and pre-serialized bodies never collide
+RESULTS_CACHE_KIND = "results"
+JSON_CACHE_KIND = "json"
+SUGGEST_CACHE_KIND = "suggest"
+
+# Metrics label of suggestion calls, which are not about a single search query
+SUGGEST_QUERY_CLASS = "suggest"
 
 
 class SearchController:
-    def __init__(self, word_repository: WordRepository) -> None:
+    def __init__(self, word_repository: WordRepository, search_cache: VersionedLRUCache | None = None) -> None:
         self.word_repository = word_repository
+        self.search_cache = search_cache
+
+    async def _refresh_cache_version(self) -> None:
+        if self.search_cache is not None and self.search_cache.version_check_due():
+            self.search_cache.set_version(await self.word_repository.get_dataset_version())
+
+    async def dataset_version(self) -> int:
+        """The cache's periodically refreshed dataset version, or the database's when there is no cache."""
+        if self.search_cache is None:
+            return await self.word_repository.get_dataset_version()
+        await self._refresh_cache_version()
+        return self.search_cache.version or 0
+
+    def _search_cache_key(self, kind: str, query: str, *parts: Hashable) -> tuple[Hashable, ...]:
+        """
+        Cache key of search results: the query is keyed on what the repository ranks, so raw queries
+        that only look alike (e.g. full-width and ASCII English) never share an entry.
+        """
+        return (kind, self.word_repository.ranking_key(query), *parts, self.word_repository.weights)
+
+    async def _etag(self, *parts: Hashable) -> str:
+        """Strong entity tag of a response body, derived from the dataset version and everything shaping the body."""
+        key = repr((await self.dataset_version(), *parts))
+        return f'"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+
+    async def search_etag(self, query: str, limit: int = 20, after: SearchCursor | None = None) -> str:
+        """Entity tag of the `search_json` page for these arguments, known without computing the page."""
+        return await self._etag(*self._search_cache_key(JSON_CACHE_KIND, query, limit, after))
+
+    async def suggest_etag(self, query: str, limit: int = 10) -> str:
+        return await self._etag(SUGGEST_CACHE_KIND, nfkc(query), limit)
+
+    async def search_json(
+        self, query: str, limit: int = 20, after: SearchCursor | None = None
+    ) -> tuple[bytes, SearchCursor | None]:
+        """
+        One page of ranked results, as a ready-to-send JSON array built from the stored word cards,
+        along with the cursor of the next page (None on the last page).
+        """
+        with SEARCH_STAGE_SECONDS.time(TOTAL_STAGE, self.word_repository.query_class(query)):
+            return await self._cached_search_json(query, limit, after)
+
+    async def _cached_search_json(
+        self, query: str, limit: int, after: SearchCursor | None
+    ) -> tuple[bytes, SearchCursor | None]:
+        if self.search_cache is None or not self.search_cache.enabled:
+            return await self._search_json(query, limit, after)
 
-    async def search(self, query: str, limit: int = 20) -> list:
-        ranked_rows = await self.word_repository.rank_word_ids_for_query(query, limit)
-        word_ids = [row["word_id"] for row in ranked_rows]
-        if not word_ids:
-            return []
-
-        score_by_id = {row["word_id"]: float(row["score"]) for row in ranked_rows}
-        details_by_id = await self.word_repository.get_word_details_by_ids(word_ids)
-
-        results = []
-        for wid in word_ids:
-            details = details_by_id.get(wid, {"readings": [], "kanji": [], "glosses": []})
-            results.append(
-                {
-                    "id": wid,
-                    "kanjis": details.get("kanji", []),
-                    "readings": details.get("readings", []),
-                    "glosses": details.get("glosses", []),
-                    "score": score_by_id.get(wid, 0.0),
-                }
-            )
+        await self._refresh_cache_version()
+        cache_key = self._search_cache_key(JSON_CACHE_KIND, query, limit, after)
+        page = self.search_cache.get(cache_key)
+        if page is None:
+            page = await self._search_json(query, limit, after)
+            self.search_cache.set(cache_key, page)
+        return page
 
+    async def suggest_json(self, query: str, limit: int = 10) -> bytes:
+        """Typeahead suggestions for a partial query, as a ready-to-send JSON array of word cards."""
+        with SEARCH_STAGE_SECONDS.time(TOTAL_STAGE, SUGGEST_QUERY_CLASS):
+            return await self._cached_suggest_json(query, limit)
+
+    async def _cached_suggest_json(self, query: str, limit: int) -> bytes:
+        if self.search_cache is None or not self.search_cache.enabled:
+            return await self._suggest_json(query, limit)
+
+        await self._refresh_cache_version()
+        cache_key = (SUGGEST_CACHE_KIND, nfkc(query), limit)
+        body = self.search_cache.get(cache_key)
+        if body is None:
+            body = await self._suggest_json(query, limit)
+            self.search_cache.set(cache_key, body)
+        return body
+
+    async def search_batch(self, queries: list[str], limit: int = 20) -> list[list]:
+        with SEARCH_STAGE_SECONDS.time(TOTAL_STAGE, BATCH_QUERY_CLASS):
+            return await self._cached_search_batch(queries, limit)
+
+    async def _cached_search_batch(self, queries: list[str], limit: int) -> list[list]:
+        if self.search_cache is None or not self.search_cache.enabled:
+            return await self._search_batch(queries, limit)
+
+        await self._refresh_cache_version()
+        cache_keys = [self._search_cache_key(RESULTS_CACHE_KIND, query, limit) for query in queries]
+        results = [self.search_cache.get(cache_key) for cache_key in cache_keys]
+        missing = [position for position, cached in enumerate(results) if cached is None]
+        if missing:
+            fetched = await self._search_batch([queries[position] for position in missing], limit)
+            for position, found in zip(missing, fetched, strict=True):
+                results[position] = found
+                self.search_cache.set(cache_keys[position], found)
         return results
+
+    async def _search_json(
+        self, query: str, limit: int, after: SearchCursor | None
+    ) -> tuple[bytes, SearchCursor | None]:
+        # One extra row tells whether another page follows
+        cards = await self.word_repository.search_word_cards(query, limit + 1, after)
+        with SEARCH_STAGE_SECONDS.time(ASSEMBLE_STAGE, self.word_repository.query_class(query)):
+            next_cursor = None
+            if len(cards) > limit:
+                cards = cards[:limit]
+                word_id, score, _ = cards[-1]
+                next_cursor = SearchCursor(score, word_id)
+
+            # Each payload is a JSON object: splice the score in right after its opening brace
+            items = ",".join(f'{{"score":{score!r},{payload[1:]}' for _, score, payload in cards)
+            return f"[{items}]".encode(), next_cursor
+
+    async def _suggest_json(self, query: str, limit: int) -> bytes:
+        payloads = await self.word_repository.suggest_word_cards(query, limit)
+        with SEARCH_STAGE_SECONDS.time(ASSEMBLE_STAGE, SUGGEST_QUERY_CLASS):
+            return f"[{','.join(payloads)}]".encode()
+
+    async def _search_batch(self, queries: list[str], limit: int) -> list[list]:
+        rows_per_query = await self.word_repository.search_words_batch(queries, limit)
+        with SEARCH_STAGE_SECONDS.time(ASSEMBLE_STAGE, BATCH_QUERY_CLASS):
+            return [[self._to_result(row) for row in rows] for rows in rows_per_query]
+
+    @staticmethod
+    def _to_result(row: RankedWordDetails) -> dict:
+        return {
+            "id": row["word_id"],
+            "kanjis": row["kanji"],
+            "readings": row["readings"],
+            "glosses": row["glosses"],
+            "score": row["score"],
+        }
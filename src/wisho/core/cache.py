@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, NamedTuple
+
+
+class _CacheEntry(NamedTuple):
+    expires_at: float
+    value: Any
+
+
+class VersionedLRUCache:
+    """
+    Bounded LRU cache with a per-entry TTL, tied to a dataset version.
+
+    Changing the version drops every entry, so results computed against an older
+    dictionary are never served. The version itself is supplied by the caller,
+    which is told through `version_check_due` when it is time to re-read it.
+    With a `max_size` of 0 nothing is stored, and only that version tracking is left.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, version_check_interval_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.version_check_interval_seconds = version_check_interval_seconds
+        self.version: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._version_checked_at = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def version_check_due(self) -> bool:
+        return time.monotonic() - self._version_checked_at >= self.version_check_interval_seconds
+
+    def set_version(self, version: int) -> None:
+        self._version_checked_at = time.monotonic()
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: Hashable) -> Any | None:  # noqa: ANN401
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        if not self.enabled:
+            return
+        self._entries[key] = _CacheEntry(time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
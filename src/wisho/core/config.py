@@ -1,6 +1,6 @@
 from functools import lru_cache
 
-from pydantic import Field, PostgresDsn
+from pydantic import Field, PostgresDsn, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 ENV_FILE = ".env"
@@ -17,6 +17,19 @@ class DatabaseSettings(BaseSettings):
     future: bool = True
     expire_on_commit: bool = False
 
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout_seconds: float = 30.0
+    # Connections older than this are replaced on checkout (-1 keeps them forever)
+    pool_recycle_seconds: int = 1800
+    # Prepared statements kept by asyncpg per connection (0 disables the cache)
+    statement_cache_size: int = 500
+    # Server-side limit for a single statement (0 disables it)
+    statement_timeout_ms: int = 0
+    # Open `pool_size` connections and prepare the hot search statements at startup. Off by default so the app
+    # starts without a database (tests, tooling); deployments enable it with `DB_PREWARM=true`
+    prewarm: bool = False
+
     hostname: str = "localhost"
     port: int = 5432
     user: str = "wisho"
@@ -36,6 +49,37 @@ class DatabaseSettings(BaseSettings):
         return str(dsn)
 
 
+class SearchCacheSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="SEARCH_CACHE_",
+        extra="ignore",
+        env_file=ENV_FILE,
+    )
+
+    # 0 disables result caching; the dataset version is still only re-read every `version_check_interval_seconds`
+    max_size: int = 10_000
+    ttl_seconds: float = 300.0
+    # How often the dataset version is re-read to invalidate results (and ETags) after a reseed
+    version_check_interval_seconds: float = 5.0
+
+
+class SlowQuerySettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="SLOW_QUERY_",
+        extra="ignore",
+        env_file=ENV_FILE,
+    )
+
+    # Off by default: every repository statement is timed while enabled
+    enabled: bool = False
+    threshold_ms: float = 500.0
+    # Slow statements kept for `/api/v1/debug/slow-queries`, oldest dropped first
+    max_size: int = 100
+    # Share of slow statements re-run under EXPLAIN (ANALYZE, BUFFERS), and how many such runs may overlap
+    explain_sample_rate: float = 0.1
+    max_concurrent_explains: int = 1
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         extra="ignore",
@@ -45,8 +89,20 @@ class Settings(BaseSettings):
     host: str = "127.0.0.1"
     port: int = 8000
     cors_allow_origins: str = "http://localhost:3000"
+    # Serve Japanese prefix ranking from an in-memory index loaded at startup
+    in_memory_prefix_index: bool = False
+    # How often the dataset version is re-read to reload that index after a reseed
+    prefix_index_reload_interval_seconds: float = 30.0
+    # Cache-Control max-age of search and suggest responses, for browsers and CDNs; they revalidate with the ETag after
+    search_response_max_age_seconds: int = 60
+    # Bearer token the `/api/v1/debug` endpoints require; while unset they answer 404, as they expose users' queries
+    debug_token: SecretStr | None = None
+    # Named `SearchWeights` overrides (e.g. {"b": {"kanji_weight": 6.0}}) selectable per request for ranking experiments
+    search_weight_variants: dict[str, dict[str, float]] = Field(default_factory=dict)
 
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
+    search_cache: SearchCacheSettings = Field(default_factory=SearchCacheSettings)
+    slow_query: SlowQuerySettings = Field(default_factory=SlowQuerySettings)
 
     @property
     def cors_origins(self) -> list[str]:
@@ -1,16 +1,40 @@
+import time
 from collections.abc import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from wisho.core.config import get_settings
+from wisho.core.metrics import DB_POOL_CHECKOUT_SECONDS
 
 settings = get_settings()
 
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Default async queue pool, recording how long each checkout waits (connecting included)."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
+
 async_engine = create_async_engine(
     settings.database.uri,
     echo=settings.database.echo,
     future=settings.database.future,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=settings.database.pool_size,
+    max_overflow=settings.database.max_overflow,
+    pool_timeout=settings.database.pool_timeout_seconds,
+    pool_recycle=settings.database.pool_recycle_seconds,
+    connect_args={
+        "prepared_statement_cache_size": settings.database.statement_cache_size,
+        "server_settings": {"statement_timeout": str(settings.database.statement_timeout_ms)},
+    },
 )
 
 local_session = async_sessionmaker(
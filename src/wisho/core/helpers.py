@@ -3,6 +3,33 @@ import unicodedata
 
 JR_CHAR_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]")
 
+# Sorts after every other code point, so `key <= x < key + PREFIX_UPPER_BOUND` is a prefix range
+PREFIX_UPPER_BOUND = "\U0010ffff"
+
+LONG_VOWEL_MARK = "ー"
+
+# Katakana -> hiragana: ァ..ヶ sit exactly 0x60 above ぁ..ゖ
+KATAKANA_TO_HIRAGANA_TABLE = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+SMALL_KANA_TABLE = str.maketrans("ぁぃぅぇぉっゃゅょゎゕゖ", "あいうえおつやゆよわかけ")
+
+# Katakana -> hiragana and small kana -> full-size kana, in one pass
+KANA_FOLD_TABLE = {
+    code: SMALL_KANA_TABLE.get(hiragana, hiragana) for code, hiragana in KATAKANA_TO_HIRAGANA_TABLE.items()
+} | SMALL_KANA_TABLE
+
+KANA_VOWELS = {
+    kana: vowel
+    for vowel, row in (
+        ("あ", "あかがさざただなはばぱまやらわ"),
+        ("い", "いきぎしじちぢにひびぴみりゐ"),
+        ("う", "うくぐすずつづぬふぶぷむゆるゔ"),
+        ("え", "えけげせぜてでねへべぺめれゑ"),
+        ("お", "おこごそぞとどのほぼぽもよろを"),
+    )
+    for kana in row
+}
+
 
 def nfkc(text: str) -> str:
     return unicodedata.normalize("NFKC", text).strip()
@@ -10,3 +37,22 @@ def nfkc(text: str) -> str:
 
 def is_japanese_text(text: str) -> bool:
     return bool(JR_CHAR_RE.search(text))
+
+
+def fold_kana(text: str) -> str:
+    """
+    Make kana script-insensitive: katakana becomes hiragana, small kana become full-size,
+    and a long vowel mark is spelled out as the vowel of the kana before it (らーめん -> らあめん).
+    """
+    folded: list[str] = []
+    for char in text.translate(KANA_FOLD_TABLE):
+        if char == LONG_VOWEL_MARK and folded and folded[-1] in KANA_VOWELS:
+            folded.append(KANA_VOWELS[folded[-1]])
+        else:
+            folded.append(char)
+    return "".join(folded)
+
+
+def search_key(text: str) -> str:
+    """Normalized form stored in `search_text` columns and applied to queries before prefix lookups."""
+    return fold_kana(nfkc(text).lower())
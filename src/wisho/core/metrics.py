@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Self, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from types import TracebackType
+
+# Prometheus text exposition format, as served by `/metrics`
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from sub-millisecond in-memory work to slow statements
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+COUNTER_TYPE = "counter"
+GAUGE_TYPE = "gauge"
+
+# `stage` label values of `SEARCH_STAGE_SECONDS`
+TOTAL_STAGE = "total"  # a whole controller call, cache lookups included
+RANK_STAGE = "rank"  # ranking alone, in SQL or on the in-memory prefix index
+HYDRATE_STAGE = "hydrate"  # loading the cards of already ranked words
+RANK_AND_FETCH_STAGE = "rank_and_fetch"  # a single statement ranking words and joining their cards
+SUGGEST_STAGE = "suggest"  # the precomputed suggestions lookup
+ASSEMBLE_STAGE = "assemble"  # building the response from repository rows
+VALIDATE_STAGE = "validate"  # pydantic response validation and serialization
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        # Per-bucket (not cumulative) counts, the last one being the +Inf bucket
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_label_values", "_start")
+
+    def __init__(self, histogram: Histogram, label_values: tuple[str, ...]) -> None:
+        self._histogram = histogram
+        self._label_values = label_values
+
+    def __enter__(self) -> Self:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self._histogram.observe(time.perf_counter() - self._start, *self._label_values)
+
+
+class Histogram:
+    """
+    Prometheus histogram with one series per combination of label values.
+
+    Recording is a dict lookup, a bisect and two additions, so it can sit on the hot path;
+    cumulative bucket counts are only computed when rendering.
+    """
+
+    def __init__(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = (), buckets: tuple[float, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets or LATENCY_BUCKETS
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+
+    def time(self, *label_values: str) -> _Timer:
+        """Context manager observing the wall-clock duration of its block."""
+        return _Timer(self, label_values)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series.counts, strict=True):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.label_names, label_values, f'le="{le}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(series.total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric:
+    """Counter or gauge whose samples are read from `collect` at scrape time, for state kept elsewhere."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+        label_names: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.label_names = label_names
+        self._collect = collect
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        for label_values, value in self._collect():
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+M = TypeVar("M", Histogram, CallbackMetric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Histogram | CallbackMetric] = {}
+
+    def register(self, metric: M) -> M:
+        """Add `metric`, replacing any earlier one of the same name (e.g. after an application restart)."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics.values() for line in metric.render()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+SEARCH_STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "wisho_search_stage_seconds",
+        "Time spent in each stage of the search pipeline, by query class.",
+        ("stage", "query_class"),
+    )
+)
+DB_POOL_CHECKOUT_SECONDS = REGISTRY.register(
+    Histogram("wisho_db_pool_checkout_seconds", "Time spent waiting for a pooled database connection.")
+)
@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+import math
+from typing import NamedTuple
+
+from wisho.errors.pagination import InvalidCursorError
+
+# Word ids are Postgres integers: larger ones would fail as bind parameters
+MAX_WORD_ID = 2**31 - 1
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SearchCursor(NamedTuple):
+    """Position of the last result of a page in the (score desc, word_id asc) ranking order."""
+
+    score: float
+    word_id: int
+
+
+def encode_cursor(cursor: SearchCursor) -> str:
+    """Opaque, URL-safe token for `cursor`."""
+    raw = json.dumps([cursor.score, cursor.word_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> SearchCursor:
+    """Cursor of an `encode_cursor` token, raising `InvalidCursorError` for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        score, word_id = json.loads(raw)
+        # JSON also decodes booleans, NaN and infinities, which no ranked row can have
+        is_valid = (
+            type(score) in (int, float)
+            and math.isfinite(score)
+            and type(word_id) is int
+            and 0 <= word_id <= MAX_WORD_ID
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, OverflowError) as e:
+        raise InvalidCursorError(token) from e
+    if not is_valid:
+        raise InvalidCursorError(token)
+    return SearchCursor(float(score), word_id)
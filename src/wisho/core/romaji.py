@@ -0,0 +1,233 @@
+import re
+
+from wisho.core.helpers import KATAKANA_TO_HIRAGANA_TABLE, LONG_VOWEL_MARK, nfkc
+
+ROMAJI_VOWELS = "aiueo"
+SOKUON = "っ"
+SYLLABIC_N = "ん"
+# Hepburn spells ん as "m" before these consonants (shimbun, sampo)
+SYLLABIC_M_BEFORE = frozenset("bmp")
+
+# Queries made only of these characters are candidates for romaji search
+ROMAJI_QUERY_RE = re.compile(r"[a-z'-]+")
+
+KANA_ROMAJI: dict[str, str] = {
+    kana: consonant + vowel
+    for consonant, row in (
+        ("", "あいうえお"),
+        ("k", "かきくけこ"),
+        ("g", "がぎぐげご"),
+        ("s", "さしすせそ"),
+        ("z", "ざじずぜぞ"),
+        ("t", "たちつてと"),
+        ("d", "だぢづでど"),
+        ("n", "なにぬねの"),
+        ("h", "はひふへほ"),
+        ("b", "ばびぶべぼ"),
+        ("p", "ぱぴぷぺぽ"),
+        ("m", "まみむめも"),
+        ("r", "らりるれろ"),
+    )
+    for kana, vowel in zip(row, ROMAJI_VOWELS, strict=True)
+} | {
+    "し": "shi",
+    "じ": "ji",
+    "ち": "chi",
+    "つ": "tsu",
+    "ぢ": "ji",
+    "づ": "zu",
+    "ふ": "fu",
+    "や": "ya",
+    "ゆ": "yu",
+    "よ": "yo",
+    "わ": "wa",
+    "ゐ": "i",
+    "ゑ": "e",
+    "を": "o",
+    "ん": "n",
+    "ゔ": "vu",
+    # Small kana outside of a digraph are read as their full-size counterpart
+    "ぁ": "a",
+    "ぃ": "i",
+    "ぅ": "u",
+    "ぇ": "e",
+    "ぉ": "o",
+    "ゃ": "ya",
+    "ゅ": "yu",
+    "ょ": "yo",
+    "ゎ": "wa",
+    "ゕ": "ka",
+    "ゖ": "ke",
+}
+
+# Two-kana syllables: palatalized rows (きゃ) plus the common loanword spellings (ふぁ, てぃ)
+KANA_DIGRAPH_ROMAJI: dict[str, str] = {
+    base + small: (stem if stem in {"sh", "ch", "j"} else stem + "y") + vowel
+    for base in "きぎしじちぢにひびぴみり"
+    for stem in (KANA_ROMAJI[base][:-1],)
+    for small, vowel in (("ゃ", "a"), ("ゅ", "u"), ("ょ", "o"))
+} | {
+    "しぇ": "she",
+    "じぇ": "je",
+    "ちぇ": "che",
+    "ふぁ": "fa",
+    "ふぃ": "fi",
+    "ふぇ": "fe",
+    "ふぉ": "fo",
+    "てぃ": "ti",
+    "でぃ": "di",
+    "うぃ": "wi",
+    "うぇ": "we",
+    "うぉ": "wo",
+    "ゔぁ": "va",
+    "ゔぃ": "vi",
+    "ゔぇ": "ve",
+    "ゔぉ": "vo",
+}
+
+# Kana that share their romaji with a more common one, or that queries never spell on their own
+UNPARSED_KANA = frozenset("ゐゑをぁぃぅぇぉゃゅょゎゕゖん")
+
+# Romaji -> kana for query parsing, including the usual alternative input spellings
+ROMAJI_KANA: dict[str, str] = {}
+for _kana, _romaji in (KANA_DIGRAPH_ROMAJI | KANA_ROMAJI).items():
+    if _kana not in UNPARSED_KANA:
+        ROMAJI_KANA.setdefault(_romaji, _kana)
+ROMAJI_KANA |= {
+    "si": "し",
+    "zi": "じ",
+    "tu": "つ",
+    "hu": "ふ",
+    "sya": "しゃ",
+    "syu": "しゅ",
+    "syo": "しょ",
+    "zya": "じゃ",
+    "zyu": "じゅ",
+    "zyo": "じょ",
+    "jya": "じゃ",
+    "jyu": "じゅ",
+    "jyo": "じょ",
+    "tya": "ちゃ",
+    "tyu": "ちゅ",
+    "tyo": "ちょ",
+    "cya": "ちゃ",
+    "cyu": "ちゅ",
+    "cyo": "ちょ",
+    # Particle を, which queries spell "wo" far more often than the loanword うぉ
+    "wo": "を",
+    "-": LONG_VOWEL_MARK,
+}
+ROMAJI_MAX_LENGTH = max(map(len, ROMAJI_KANA))
+
+# Unfinished syllables a query may end with while it is being typed (e.g. the "b" of "tab")
+ROMAJI_FRAGMENTS = (
+    {romaji[:size] for romaji in ROMAJI_KANA for size in range(1, len(romaji))}
+    | {
+        romaji[0] + romaji[:size]
+        for romaji in ROMAJI_KANA
+        if romaji[0] not in ROMAJI_VOWELS
+        for size in range(1, len(romaji))
+    }
+    | {"n", "tc"}
+) - {"-"}
+
+
+def kana_to_romaji(text: str) -> str:
+    """
+    Hepburn-style romaji of a kana string, as stored in `readings.romaji`:
+    っ doubles the next consonant, ー repeats the previous vowel and ん is always "n".
+    Characters that are not kana are kept as they are.
+    """
+    text = nfkc(text).lower().translate(KATAKANA_TO_HIRAGANA_TABLE)
+    parts: list[str] = []
+    double_next = False
+    position = 0
+    while position < len(text):
+        if (romaji := KANA_DIGRAPH_ROMAJI.get(text[position : position + 2])) is not None:
+            position += 2
+        else:
+            char = text[position]
+            position += 1
+            if char == SOKUON:
+                double_next = True
+                continue
+            if char == LONG_VOWEL_MARK:
+                romaji = parts[-1][-1] if parts and parts[-1] and parts[-1][-1] in ROMAJI_VOWELS else ""
+            else:
+                romaji = KANA_ROMAJI.get(char, char)
+
+        if double_next and romaji and romaji[0] not in ROMAJI_VOWELS:
+            romaji = romaji[0] + romaji
+        double_next = False
+        parts.append(romaji)
+    return "".join(parts)
+
+
+def _parse_romaji(text: str) -> tuple[str, str]:
+    """Convert as much of `text` as possible to kana, returning (kana, unconverted rest)."""
+    kana: list[str] = []
+    position = 0
+    while position < len(text):
+        rest = text[position:]
+        if rest[0] == "n" and rest[1:2] not in (*ROMAJI_VOWELS, "y", ""):
+            # Syllabic n: "n'", "nn" or "n" before another consonant
+            kana.append(SYLLABIC_N)
+            position += 2 if rest[1] == "'" or rest == "nn" else 1
+            continue
+        if rest[0] == "m" and rest[1:2] in SYLLABIC_M_BEFORE:
+            kana.append(SYLLABIC_N)
+            position += 1
+            continue
+
+        for size in range(min(ROMAJI_MAX_LENGTH, len(rest)), 0, -1):
+            if (syllable := ROMAJI_KANA.get(rest[:size])) is not None:
+                kana.append(syllable)
+                position += size
+                break
+        else:
+            # A doubled consonant (or "tch") is a small tsu, provided a syllable follows it
+            is_sokuon = rest[:1] not in ROMAJI_VOWELS and (rest[:1] == rest[1:2] or rest.startswith("tch"))
+            if not is_sokuon or not any(rest[1 : 1 + size] in ROMAJI_KANA for size in range(1, ROMAJI_MAX_LENGTH + 1)):
+                break
+            kana.append(SOKUON)
+            position += 1
+    return "".join(kana), text[position:]
+
+
+def romaji_kana_prefixes(text: str) -> list[str]:
+    """
+    Kana spellings a romaji string being typed can continue as: just its kana when it is complete,
+    or one per syllable its unfinished trailing fragment may start ("tab" -> たば, たび, たぶ...).
+    Empty when some of it is not romaji.
+    """
+    kana, rest = _parse_romaji(text.lower())
+    if not rest:
+        return [kana] if kana else []
+    if rest not in ROMAJI_FRAGMENTS:
+        return []
+
+    # A doubled consonant ("takk") or "tc" ("matc") is a small tsu before the syllable being typed
+    if rest[0] == rest[1:2] or rest == "tc":
+        kana, rest = kana + SOKUON, rest[1:]
+    prefixes = [kana + syllable for romaji, syllable in ROMAJI_KANA.items() if romaji.startswith(rest)]
+    if rest in ("n", "m"):
+        prefixes.append(kana + SYLLABIC_N)
+    elif kana and len(rest) == 1 and not kana.endswith(SOKUON):
+        # ...or the first half of a doubled consonant ("mat" -> まって)
+        prefixes.append(kana + SOKUON)
+    return list(dict.fromkeys(prefixes))
+
+
+def romaji_search_key(query: str) -> str | None:
+    """
+    Canonical romaji of a query to prefix-match against `readings.romaji`, or None when the query
+    is not romaji. The query is read as kana and spelled back, so "tu"/"tsu" or "matcha"/"maccha"
+    agree with the stored form; an unfinished trailing syllable is kept as is for prefix matching.
+    """
+    text = nfkc(query).lower()
+    if not ROMAJI_QUERY_RE.fullmatch(text):
+        return None
+    kana, rest = _parse_romaji(text)
+    if rest and rest not in ROMAJI_FRAGMENTS:
+        return None
+    return kana_to_romaji(kana) + rest
@@ -1,13 +1,160 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager
+
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.datastructures import State
 
+from wisho.core.cache import VersionedLRUCache
 from wisho.core.config import get_settings
+from wisho.core.db.session import async_engine, local_session
+from wisho.core.metrics import COUNTER_TYPE, GAUGE_TYPE, REGISTRY, CallbackMetric
+from wisho.core.pagination import NEXT_CURSOR_HEADER
+from wisho.core.slow_queries import SlowQueryLog
+from wisho.repositories.prefix_index import PrefixIndex
+from wisho.repositories.word import SearchWeights, WordRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def _prewarm_connection(prefix_index: PrefixIndex | None) -> None:
+    async with local_session() as session:
+        await WordRepository(session, prefix_index=prefix_index).prewarm()
+
+
+async def prewarm_pool(size: int, prefix_index: PrefixIndex | None) -> None:
+    """
+    Open `size` pooled connections at once and prepare the search statements on each,
+    so the first requests after startup skip both the connect and the planning cost.
+    """
+    start = time.perf_counter()
+    await asyncio.gather(*(_prewarm_connection(prefix_index) for _ in range(size)))
+    logger.info("Pre-warmed %d database connections in %.2fs", size, time.perf_counter() - start)
+
+
+async def reload_prefix_index(state: State, interval_seconds: float) -> None:
+    """
+    Poll the dataset version every `interval_seconds` and load a new prefix index once a reseed changed it.
+    Requests keep ranking on the previous index until the new one is fully loaded and swapped in.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        current: PrefixIndex = state.prefix_index
+        try:
+            async with local_session() as session:
+                if await WordRepository(session).get_dataset_version() == current.dataset_version:
+                    continue
+                index = await PrefixIndex.load(session)
+        except (SQLAlchemyError, OSError):
+            logger.exception("Could not reload the prefix index")
+            continue
+
+        # Memo counters are exposed as counters, so they carry over to the new index
+        index.memo_hits, index.memo_misses = current.memo_hits, current.memo_misses
+        state.prefix_index = index
+
+
+def register_state_metrics(state: State) -> None:
+    """Expose the connection pool and the cache counters of the app `state`, read at scrape time."""
+    pool = async_engine.pool
+    REGISTRY.register(
+        CallbackMetric(
+            "wisho_db_pool_connections",
+            "Pooled database connections, by state.",
+            GAUGE_TYPE,
+            lambda: [(("checked_out",), pool.checkedout()), (("idle",), pool.checkedin())],
+            ("state",),
+        )
+    )
+
+    # (hits, misses) of every cache in use
+    cache_counts: dict[str, Callable[[], tuple[int, int]]] = {}
+    if state.search_cache is not None and state.search_cache.enabled:
+        search_cache: VersionedLRUCache = state.search_cache
+        cache_counts["search"] = lambda: (search_cache.hits, search_cache.misses)
+    if state.prefix_index is not None:
+        # Read through the state, as the index is replaced after a reseed
+        cache_counts["prefix_index_memo"] = lambda: (state.prefix_index.memo_hits, state.prefix_index.memo_misses)
+
+    def collect_lookups() -> Iterator[tuple[tuple[str, ...], float]]:
+        for name, counts in cache_counts.items():
+            hits, misses = counts()
+            yield (name, "hit"), hits
+            yield (name, "miss"), misses
+
+    def collect_hit_ratios() -> Iterator[tuple[tuple[str, ...], float]]:
+        for name, counts in cache_counts.items():
+            hits, misses = counts()
+            yield (name,), hits / (hits + misses) if hits + misses else 0.0
+
+    REGISTRY.register(
+        CallbackMetric(
+            "wisho_cache_lookups_total",
+            "Cache lookups, by cache and result.",
+            COUNTER_TYPE,
+            collect_lookups,
+            ("cache", "result"),
+        )
+    )
+    REGISTRY.register(
+        CallbackMetric(
+            "wisho_cache_hit_ratio",
+            "Share of cache lookups served from the cache since startup.",
+            GAUGE_TYPE,
+            collect_hit_ratios,
+            ("cache",),
+        )
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+
+    # Created even when disabled (max size 0), as ETags still need its periodically refreshed dataset version
+    app.state.search_cache = VersionedLRUCache(
+        max_size=settings.search_cache.max_size,
+        ttl_seconds=settings.search_cache.ttl_seconds,
+        version_check_interval_seconds=settings.search_cache.version_check_interval_seconds,
+    )
+
+    app.state.slow_query_log = None
+    if settings.slow_query.enabled:
+        app.state.slow_query_log = SlowQueryLog(local_session, async_engine.dialect, settings.slow_query)
+
+    app.state.search_weight_variants = {
+        name: SearchWeights(**overrides) for name, overrides in settings.search_weight_variants.items()
+    }
+
+    app.state.prefix_index = None
+    prefix_index_reload = None
+    if settings.in_memory_prefix_index:
+        async with local_session() as session:
+            app.state.prefix_index = await PrefixIndex.load(session)
+        prefix_index_reload = asyncio.create_task(
+            reload_prefix_index(app.state, settings.prefix_index_reload_interval_seconds)
+        )
+
+    register_state_metrics(app.state)
+
+    if settings.database.prewarm:
+        await prewarm_pool(settings.database.pool_size, app.state.prefix_index)
+
+    yield
+
+    if prefix_index_reload is not None:
+        prefix_index_reload.cancel()
+    await async_engine.dispose()
 
 
 def create_application(router: APIRouter) -> FastAPI:
     settings = get_settings()
 
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -15,6 +162,8 @@ def create_application(router: APIRouter) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Browser clients need these to paginate and revalidate
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
     )
 
     app.include_router(router)
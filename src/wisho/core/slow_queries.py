@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.exc import SQLAlchemyError
+
+if TYPE_CHECKING:
+    from sqlalchemy import Dialect, Select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from wisho.core.config import SlowQuerySettings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS)"
+
+
+@dataclass
+class SlowQuery:
+    query: str | None
+    statement: str
+    params: dict[str, Any]
+    duration_ms: float
+    recorded_at: datetime
+    # Filled in later by a background EXPLAIN when this query was sampled for plan capture
+    plan: str | None = None
+
+
+class SlowQueryLog:
+    """
+    Bounded ring buffer of statements slower than a threshold, for the debug endpoint.
+
+    Fast statements cost a single comparison. A sample of the slow ones is re-run under
+    `EXPLAIN (ANALYZE, BUFFERS)` on a separate session in the background, at most
+    `max_concurrent_explains` at a time, so plan capture never delays a request and
+    cannot pile up when everything turns slow at once.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        dialect: Dialect,
+        settings: SlowQuerySettings,
+    ) -> None:
+        self.threshold_seconds = settings.threshold_ms / 1000
+        self.explain_sample_rate = settings.explain_sample_rate
+        self.max_concurrent_explains = settings.max_concurrent_explains
+        self._session_factory = session_factory
+        self._dialect = dialect
+        self._entries: deque[SlowQuery] = deque(maxlen=settings.max_size)
+        self._explains: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> list[SlowQuery]:
+        """Recorded statements, newest first."""
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def observe(self, query: str | None, stmt: Select, params: dict[str, Any], seconds: float) -> None:
+        """Record `stmt` if it took longer than the threshold, and maybe schedule its plan capture."""
+        if seconds < self.threshold_seconds:
+            return
+
+        entry = SlowQuery(
+            query=query,
+            statement=str(stmt.compile(dialect=self._dialect)),
+            params=params,
+            duration_ms=seconds * 1000,
+            recorded_at=datetime.now(UTC),
+        )
+        self._entries.append(entry)
+
+        # Sampling only decides which slow statements get a plan, not which are recorded
+        if len(self._explains) < self.max_concurrent_explains and random.random() < self.explain_sample_rate:  # noqa: S311
+            task = asyncio.create_task(self._capture_plan(entry, stmt, params))
+            self._explains.add(task)
+            task.add_done_callback(self._explains.discard)
+
+    async def _capture_plan(self, entry: SlowQuery, stmt: Select, params: dict[str, Any]) -> None:
+        compiled = stmt.compile(dialect=self._dialect)
+        values = compiled.construct_params(params)
+        args = tuple(values[name] for name in compiled.positiontup or ())
+        try:
+            async with self._session_factory() as session:
+                connection = await session.connection()
+                result = await connection.exec_driver_sql(f"{EXPLAIN_PREFIX} {compiled.string}", args)
+                entry.plan = "\n".join(line for (line,) in result)
+        except SQLAlchemyError:
+            logger.exception("Could not capture the plan of a slow query")
@@ -0,0 +1,3 @@
+class InvalidCursorError(Exception):
+    def __init__(self, token: str) -> None:
+        super().__init__(f"Invalid pagination cursor: {token!r}")
@@ -1,10 +1,14 @@
-from wisho.models.jmdict import Gloss, Kanji, Reading, Sense, SenseExample, Word
+from wisho.models.dataset import DatasetVersion
+from wisho.models.jmdict import Gloss, Kanji, Reading, Sense, SenseExample, Word, WordCard, WordSuggestion
 
 __all__ = [
+    "DatasetVersion",
     "Gloss",
     "Kanji",
     "Reading",
     "Sense",
     "SenseExample",
     "Word",
+    "WordCard",
+    "WordSuggestion",
 ]
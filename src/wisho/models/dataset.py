@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from wisho.core.db.base import Base
+
+DATASET_VERSION_ROW_ID = 1
+
+
+class DatasetVersion(Base):
+    """Single-row counter bumped by the seed script whenever the dictionary content changes."""
+
+    __tablename__ = "dataset_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
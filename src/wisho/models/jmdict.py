@@ -1,17 +1,26 @@
-from sqlalchemy import Boolean, ForeignKey, Integer, String
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Boolean, Computed, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from wisho.core.db.base import Base
 
+# Number of glosses kept on a word card
+WORD_CARD_GLOSS_LIMIT = 3
+
+# Number of words precomputed for every prefix in `word_suggestions`
+WORD_SUGGESTION_LIMIT = 10
+
 
 class Word(Base):
     __tablename__ = "words"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content_hash: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    is_common: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
     kanjis: Mapped[list["Kanji"]] = relationship(back_populates="word", cascade="all, delete-orphan")
     readings: Mapped[list["Reading"]] = relationship(back_populates="word", cascade="all, delete-orphan")
     senses: Mapped[list["Sense"]] = relationship(back_populates="word", cascade="all, delete-orphan")
+    card: Mapped["WordCard"] = relationship(back_populates="word", cascade="all, delete-orphan")
 
 
 class Kanji(Base):
@@ -20,6 +29,7 @@ class Kanji(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     word_id: Mapped[int] = mapped_column(Integer, ForeignKey("words.id"), index=True)
     text: Mapped[str] = mapped_column(String, index=True)
+    search_text: Mapped[str] = mapped_column(String(collation="C"), index=True)
     is_common: Mapped[bool] = mapped_column(Boolean)
     tags: Mapped[list[str]] = mapped_column(JSONB, default=list)
     word: Mapped["Word"] = relationship(back_populates="kanjis")
@@ -31,6 +41,8 @@ class Reading(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     word_id: Mapped[int] = mapped_column(Integer, ForeignKey("words.id"), index=True)
     text: Mapped[str] = mapped_column(String, index=True)
+    search_text: Mapped[str] = mapped_column(String(collation="C"), index=True)
+    romaji: Mapped[str] = mapped_column(String(collation="C"), index=True)
     is_common: Mapped[bool] = mapped_column(Boolean)
     tags: Mapped[list[str]] = mapped_column(JSONB, default=list)
     applies_to_kanji: Mapped[list[str]] = mapped_column(JSONB, default=list)
@@ -73,4 +85,33 @@ class Gloss(Base):
     sense_id: Mapped[int] = mapped_column(Integer, ForeignKey("senses.id"), index=True)
     type: Mapped[str | None] = mapped_column(String, nullable=True)
     text: Mapped[str] = mapped_column(String)
+    text_tsv: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+    )
     sense: Mapped["Sense"] = relationship(back_populates="glosses")
+
+
+class WordCard(Base):
+    """Search result card materialized at seed time, so hydration is a primary-key fetch."""
+
+    __tablename__ = "word_cards"
+
+    word_id: Mapped[int] = mapped_column(Integer, ForeignKey("words.id"), primary_key=True)
+    readings: Mapped[list[str]] = mapped_column(ARRAY(String), default=list)
+    kanjis: Mapped[list[str]] = mapped_column(ARRAY(String), default=list)
+    glosses: Mapped[list[str]] = mapped_column(ARRAY(String), default=list)
+    is_common: Mapped[bool] = mapped_column(Boolean)
+    # Pre-serialized JSON object ({"id", "kanjis", "readings", "glosses"}) streamed as-is by the API
+    payload: Mapped[str] = mapped_column(Text)
+    word: Mapped["Word"] = relationship(back_populates="card")
+
+
+class WordSuggestion(Base):
+    """Best words for a `search_text` prefix, ranked at seed time so a typeahead lookup is a point read."""
+
+    __tablename__ = "word_suggestions"
+
+    prefix: Mapped[str] = mapped_column(String(collation="C"), primary_key=True)
+    # Word ids in ranking order
+    word_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer))
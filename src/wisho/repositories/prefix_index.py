@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from wisho.core.helpers import PREFIX_UPPER_BOUND
+from wisho.models.dataset import DATASET_VERSION_ROW_ID, DatasetVersion
+from wisho.models.jmdict import Kanji, Reading
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from wisho.core.pagination import SearchCursor
+    from wisho.repositories.word import SearchWeights
+
+logger = logging.getLogger(__name__)
+
+READING_KIND = 0
+KANJI_KIND = 1
+
+# Single-character queries match the longest runs of keys, so their rankings are memoized
+SINGLE_CHAR_MEMO_SIZE = 4096
+
+
+class PrefixIndex:
+    """
+    In-memory equivalent of `WordRepository`'s Japanese prefix ranking.
+
+    Every reading/kanji form is stored once, sorted by `search_text`, as:
+    - one concatenated string holding all keys, sliced through an offset array
+    - parallel fixed-width arrays for word id, displayed length, kind and common flag
+
+    A prefix query is a few binary searches delimiting the matching run of keys,
+    followed by the same per-word aggregation and scoring as the SQL version.
+    """
+
+    def __init__(self, forms: list[tuple[str, int, int, int, bool]], dataset_version: int = 0) -> None:
+        """
+        `forms` are (search_text, word_id, length, kind, is_common) tuples in any order,
+        read at `dataset_version`.
+        """
+        self.dataset_version = dataset_version
+        forms.sort()
+        self._keys = "".join(form[0] for form in forms)
+        self._offsets = array("I", accumulate((len(form[0]) for form in forms), initial=0))
+        self._word_ids = array("i", (form[1] for form in forms))
+        self._lengths = array("H", (min(form[2], 0xFFFF) for form in forms))
+        self._kinds = array("B", (form[3] for form in forms))
+        self._common = array("B", (form[4] for form in forms))
+        self._single_char_memo: dict[
+            tuple[str, SearchWeights, int, SearchCursor | None], list[dict[str, int | float]]
+        ] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> PrefixIndex:
+        # Read first, so a reseed committing while the forms are read leaves the index looking stale, not current
+        dataset_version = await session.scalar(
+            select(DatasetVersion.version).where(DatasetVersion.id == DATASET_VERSION_ROW_ID)
+        )
+        forms: list[tuple[str, int, int, int, bool]] = []
+        for model, kind in ((Reading, READING_KIND), (Kanji, KANJI_KIND)):
+            result = await session.execute(select(model.search_text, model.word_id, model.text, model.is_common))
+            forms.extend((key, word_id, len(text), kind, is_common) for key, word_id, text, is_common in result)
+
+        index = cls(forms, dataset_version or 0)
+        logger.info(
+            "Loaded prefix index at dataset version %d: %d forms, %.1f MiB",
+            index.dataset_version,
+            len(index),
+            index.memory_bytes() / (1 << 20),
+        )
+        return index
+
+    def __len__(self) -> int:
+        return len(self._word_ids)
+
+    def memory_bytes(self) -> int:
+        return sum(
+            sys.getsizeof(part)
+            for part in (self._keys, self._offsets, self._word_ids, self._lengths, self._kinds, self._common)
+        )
+
+    def _key_at(self, position: int) -> str:
+        return self._keys[self._offsets[position] : self._offsets[position + 1]]
+
+    def _bisect(self, key: str, lo: int = 0) -> int:
+        return bisect_left(range(len(self)), key, lo=lo, key=self._key_at)
+
+    def iter_prefix_rankings(
+        self, weights: SearchWeights, limit: int, prefixes: Iterable[str] | None = None
+    ) -> Iterator[tuple[str, list[int]]]:
+        """
+        Yield prefixes in key order with the ids of their `limit` best words: every distinct prefix of every key,
+        or only `prefixes`, whose list is empty when no key starts with them anymore.
+        """
+        if prefixes is None:
+            prefixes = {key[:size] for key in map(self._key_at, range(len(self))) for size in range(1, len(key) + 1)}
+        for prefix in sorted(prefixes):
+            yield prefix, [row["word_id"] for row in self._rank(prefix, weights, limit, None)]
+
+    def rank(
+        self, query_key: str, weights: SearchWeights, limit: int, after: SearchCursor | None = None
+    ) -> list[dict[str, int | float]]:
+        """
+        Rank word ids for an already normalized query, mirroring the SQL scoring.
+        With `after`, only words ranked after that cursor are returned (keyset pagination).
+        """
+        if len(query_key) != 1:
+            return self._rank(query_key, weights, limit, after)
+
+        memo_key = (query_key, weights, limit, after)
+        ranked = self._single_char_memo.get(memo_key)
+        if ranked is not None:
+            self.memo_hits += 1
+        else:
+            self.memo_misses += 1
+            if len(self._single_char_memo) >= SINGLE_CHAR_MEMO_SIZE:
+                self._single_char_memo.clear()
+            ranked = self._single_char_memo[memo_key] = self._rank(query_key, weights, limit, after)
+        return ranked
+
+    def _rank(
+        self, query_key: str, weights: SearchWeights, limit: int, after: SearchCursor | None
+    ) -> list[dict[str, int | float]]:
+        # Keys equal to the query sort first within the prefix run, so the exact hits are its head
+        lo = self._bisect(query_key)
+        exact_hi = self._bisect(query_key + "\0", lo)
+        hi = self._bisect(query_key + PREFIX_UPPER_BOUND, exact_hi)
+
+        min_lens: dict[tuple[int, int], int] = {}
+        common_words: set[int] = set()
+        for word_id, kind, length, is_common in zip(
+            self._word_ids[lo:hi], self._kinds[lo:hi], self._lengths[lo:hi], self._common[lo:hi], strict=True
+        ):
+            branch = (word_id, kind)
+            if length < min_lens.get(branch, 0x10000):
+                min_lens[branch] = length
+            if is_common:
+                common_words.add(word_id)
+        exact_branches = set(zip(self._word_ids[lo:exact_hi], self._kinds[lo:exact_hi], strict=True))
+
+        is_single_char = len(query_key) == 1
+        base_mult = weights.single_char_base_mult if is_single_char else 1.0
+        exact_mult = weights.single_char_exact_mult if is_single_char else 1.0
+        length_weight = weights.length_weight * (weights.single_char_length_mult if is_single_char else 1.0)
+        base_by_kind = {
+            READING_KIND: (weights.reading_weight * base_mult, weights.exact_reading_weight * exact_mult),
+            KANJI_KIND: (weights.kanji_weight * base_mult, weights.exact_kanji_weight * exact_mult),
+        }
+
+        scores: dict[int, float] = dict.fromkeys(common_words, weights.common_weight)
+        for branch, min_len in min_lens.items():
+            word_id, kind = branch
+            base, exact = base_by_kind[kind]
+            score = base + length_weight * (1.0 / (1.0 + min_len))
+            if branch in exact_branches:
+                score += exact
+            scores[word_id] = scores.get(word_id, 0.0) + score
+
+        candidates = scores.items()
+        if after is not None:
+            position = (-after.score, after.word_id)
+            candidates = [item for item in candidates if (-item[1], item[0]) > position]
+        ranked = heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], item[0]))
+        return [{"word_id": word_id, "score": score} for word_id, score in ranked]
@@ -1,33 +1,72 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, TypedDict
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, ClassVar, TypedDict
 
 from sqlalchemy import (
     Float,
     Integer,
-    RowMapping,
+    Row,
     Select,
     String,
     Subquery,
+    and_,
+    any_,
     bindparam,
     case,
     cast,
     func,
     literal,
+    literal_column,
+    or_,
     select,
+    true,
     union_all,
 )
-from sqlalchemy.dialects.postgresql import REGCONFIG
-
-from wisho.core.helpers import is_japanese_text, nfkc
-from wisho.models.jmdict import Gloss, Kanji, Reading, Sense
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG
+
+from wisho.core.helpers import PREFIX_UPPER_BOUND, is_japanese_text, nfkc, search_key
+from wisho.core.metrics import (
+    HYDRATE_STAGE,
+    RANK_AND_FETCH_STAGE,
+    RANK_STAGE,
+    SEARCH_STAGE_SECONDS,
+    SUGGEST_STAGE,
+)
+from wisho.core.romaji import romaji_kana_prefixes, romaji_search_key
+from wisho.models.dataset import DATASET_VERSION_ROW_ID, DatasetVersion
+from wisho.models.jmdict import WORD_SUGGESTION_LIMIT, Gloss, Kanji, Reading, Sense, Word, WordCard, WordSuggestion
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Hashable, Sequence
 
+    from sqlalchemy import Result
     from sqlalchemy.ext.asyncio import AsyncSession
-    from sqlalchemy.sql.elements import ColumnElement
+    from sqlalchemy.sql.elements import BindParameter, ColumnElement
+
+    from wisho.core.pagination import SearchCursor
+    from wisho.core.slow_queries import SlowQueryLog
+    from wisho.repositories.prefix_index import PrefixIndex
+
+
+BATCH_QUERIES_ALIAS = "batch_queries"
+WEIGHT_PARAM_PREFIX = "w_"
+
+JAPANESE_KIND = "japanese"
+ROMAJI_KIND = "romaji"
+ENGLISH_KIND = "english"
+# Metrics label of Japanese queries of a single character, whose prefix runs are the longest
+SINGLE_CHAR_QUERY_CLASS = "single_char"
+# Metrics label of everything done for a batch search, whatever the kinds of its queries
+BATCH_QUERY_CLASS = "batch"
+
+# Routed queries kept in memory, so repeated queries skip normalization and romaji parsing
+ROUTE_CACHE_SIZE = 4096
+
+# Japanese, romaji and English queries that match next to nothing, used to prepare each statement shape
+PREWARM_QUERIES = ("ゔゔゔ", "vuvuvu", "qqq")
 
 
 @dataclass(frozen=True)
@@ -35,21 +74,33 @@ class SearchWeights:
     """All tunable weights for ranking."""
 
     # Japanese weights
-    reading_weight = 5.0
-    kanji_weight = 5.0
-    exact_reading_weight = 6.0
-    exact_kanji_weight = 6.0
-    length_weight = 2.0
-    common_weight = 1.0
+    reading_weight: float = 5.0
+    kanji_weight: float = 5.0
+    exact_reading_weight: float = 6.0
+    exact_kanji_weight: float = 6.0
+    length_weight: float = 2.0
+    common_weight: float = 1.0
 
     # English weights
-    gloss_weight = 2.0
-    exact_word_weight = 1.5
+    gloss_weight: float = 2.0
+    exact_word_weight: float = 1.5
+
+    # Romaji prefix scores are scaled down so that exact English gloss hits still compete
+    romaji_weight: float = 0.25
 
     # Single-character multipliers
-    single_char_base_mult = 0.5
-    single_char_exact_mult = 1.75
-    single_char_length_mult = 1.25
+    single_char_base_mult: float = 0.5
+    single_char_exact_mult: float = 1.75
+    single_char_length_mult: float = 1.25
+
+    def params(self) -> dict[str, float]:
+        """Values of the `weight_param` bind parameters of the ranking statements."""
+        return {f"{WEIGHT_PARAM_PREFIX}{name}": value for name, value in asdict(self).items()}
+
+
+def weight_param(name: str) -> BindParameter[float]:
+    """Placeholder for a `SearchWeights` field, so one statement serves every weights configuration."""
+    return bindparam(f"{WEIGHT_PARAM_PREFIX}{name}", type_=Float)
 
 
 class WordDetails(TypedDict):
@@ -58,29 +109,62 @@ class WordDetails(TypedDict):
     glosses: list[str]
 
 
+class RankedWordDetails(WordDetails):
+    word_id: int
+    score: float
+
+
 class WordRepository:
     DEFAULT_LIMIT = 20
 
-    def __init__(self, session: AsyncSession, weights: SearchWeights | None = None) -> None:
+    # Statements are built once per kind and shape; queries, weights, limits and cursors are bind parameters
+    _statements: ClassVar[dict[Hashable, Select]] = {}
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        weights: SearchWeights | None = None,
+        prefix_index: PrefixIndex | None = None,
+        slow_query_log: SlowQueryLog | None = None,
+    ) -> None:
         self.session = session
         self.weights = weights or SearchWeights()
+        self.prefix_index = prefix_index
+        self.slow_query_log = slow_query_log
+
+    def _statement(self, key: Hashable, build: Callable[[], Select]) -> Select:
+        stmt = self._statements.get(key)
+        if stmt is None:
+            stmt = self._statements[key] = build()
+        return stmt
+
+    async def _execute(self, stmt: Select, params: dict[str, Any], query: str | None = None) -> Result:
+        """Execute `stmt`, reporting it to the slow query log (if any) along with the search `query` it serves."""
+        if self.slow_query_log is None:
+            return await self.session.execute(stmt, params)
+
+        # Statements that fail (e.g. on `statement_timeout`) are often the slowest, so they are recorded too
+        start = time.perf_counter()
+        try:
+            return await self.session.execute(stmt, params)
+        finally:
+            self.slow_query_log.observe(query, stmt, params, time.perf_counter() - start)
 
     @staticmethod
-    def _param_is_single_char(param_name: str) -> ColumnElement[bool]:
-        q = bindparam(param_name)
+    def _is_single_char(q: ColumnElement[str]) -> ColumnElement[bool]:
         return func.char_length(q) == 1
 
     def _length_decay_bonus(
         self,
         min_len_col: ColumnElement[int],
-        param_name: str,
+        q: ColumnElement[str],
     ) -> ColumnElement[float]:
         """
         Reward shorter matches a bit more: weight * 1/(1+min_len).
         Boost slightly when the query is a single character.
         """
-        w = literal(self.weights.length_weight) * case(
-            (self._param_is_single_char(param_name), literal(self.weights.single_char_length_mult)),
+        w = weight_param("length_weight") * case(
+            (self._is_single_char(q), weight_param("single_char_length_mult")),
             else_=literal(1.0),
         )
         # 1 / (1 + len) stays bounded and gently favors shorter forms
@@ -90,24 +174,29 @@ class WordRepository:
         self,
         model: type[Reading] | type[Kanji],
         *,
-        param_name: str,
+        q: ColumnElement[str],
+        key: ColumnElement[str] | None = None,
     ) -> Subquery:
         """
-        For a prefix query against `model.text`, return per-word:
+        For a prefix query against `key` (default: `model.search_text`), return per-word:
         - min_len: the shortest matched form length
         - is_exact: whether any form exactly equals the query
         - any_common: whether any form is flagged common
+
+        The prefix is expressed as a half-open range on the C-collated column,
+        so it is served by a plain btree range scan even for one-character queries.
         """
-        q = bindparam(param_name)
-        prefix = func.concat(q, literal("%"))
+        if key is None:
+            key = model.search_text
+        upper_bound = func.concat(q, literal(PREFIX_UPPER_BOUND))
         return (
             select(
                 model.word_id.label("word_id"),
                 func.min(func.char_length(model.text)).label("min_len"),
-                func.max(case((model.text == q, literal(1)), else_=literal(0))).label("is_exact"),
+                func.max(case((key == q, literal(1)), else_=literal(0))).label("is_exact"),
                 func.max(case((model.is_common.is_(True), literal(1)), else_=literal(0))).label("any_common"),
             )
-            .where(model.text.ilike(prefix))
+            .where(key >= q, key < upper_bound)
             .group_by(model.word_id)
         ).subquery()
 
@@ -115,57 +204,63 @@ class WordRepository:
         self,
         model: type[Reading] | type[Kanji],
         *,
-        param_name: str,
-        base_weight: float,
-        exact_weight: float,
+        q: ColumnElement[str],
+        base_weight: ColumnElement[float],
+        exact_weight: ColumnElement[float],
+        key: ColumnElement[str] | None = None,
     ) -> Select:
         """
         Score a prefix branch (readings or kanji):
         base + exact_match_bonus + length_bonus.
         """
-        s = self._prefix_match_stats_for(model, param_name=param_name)
+        s = self._prefix_match_stats_for(model, q=q, key=key)
 
-        base = literal(base_weight) * case(
-            (self._param_is_single_char(param_name), literal(self.weights.single_char_base_mult)),
+        base = base_weight * case(
+            (self._is_single_char(q), weight_param("single_char_base_mult")),
             else_=literal(1.0),
         )
 
         exact = case(
             (
                 s.c.is_exact == 1,
-                literal(exact_weight)
+                exact_weight
                 * case(
-                    (self._param_is_single_char(param_name), literal(self.weights.single_char_exact_mult)),
+                    (self._is_single_char(q), weight_param("single_char_exact_mult")),
                     else_=literal(1.0),
                 ),
             ),
             else_=literal(0.0),
         )
 
-        score = base + exact + self._length_decay_bonus(s.c.min_len, param_name)
+        score = base + exact + self._length_decay_bonus(s.c.min_len, q)
         return select(s.c.word_id, score.label("branch_score"), s.c.any_common)
 
-    def _build_japanese_prefix_ranking_query(self) -> Select:
+    def _build_japanese_prefix_ranking_query(self, q: ColumnElement[str] | None = None) -> Select:
         """
         Rank by prefix matches across readings and kanji, with per-word aggregation.
+        `q` defaults to the `q_norm` bind parameter; batch search passes a column instead.
         """
+        if q is None:
+            q = bindparam("q_norm", type_=String)
         reading_branch = self._score_prefix_branch_for(
             Reading,
-            param_name="q_norm",
-            base_weight=self.weights.reading_weight,
-            exact_weight=self.weights.exact_reading_weight,
+            q=q,
+            base_weight=weight_param("reading_weight"),
+            exact_weight=weight_param("exact_reading_weight"),
         )
         kanji_branch = self._score_prefix_branch_for(
             Kanji,
-            param_name="q_norm",
-            base_weight=self.weights.kanji_weight,
-            exact_weight=self.weights.exact_kanji_weight,
+            q=q,
+            base_weight=weight_param("kanji_weight"),
+            exact_weight=weight_param("exact_kanji_weight"),
         )
 
-        all_hits = union_all(
-            select(reading_branch.c.word_id, reading_branch.c.branch_score, reading_branch.c.any_common),
-            select(kanji_branch.c.word_id, kanji_branch.c.branch_score, kanji_branch.c.any_common),
-        ).subquery()
+        return self._aggregate_prefix_branches(reading_branch, kanji_branch)
+
+    def _aggregate_prefix_branches(self, *branches: Select) -> Select:
+        """Sum branch scores per word and add the common bonus once per word."""
+        # Every branch selects (word_id, branch_score, any_common), so they are unioned as they are
+        all_hits = union_all(*branches).subquery()
 
         per_word = (
             select(
@@ -176,41 +271,23 @@ class WordRepository:
         ).subquery()
 
         final_score = per_word.c.base_score + case(
-            (per_word.c.has_common == 1, literal(self.weights.common_weight)),
+            (per_word.c.has_common == 1, weight_param("common_weight")),
             else_=literal(0.0),
         )
 
-        return select(per_word.c.word_id, final_score.label("score")).order_by(final_score.desc())
-
-    def _any_common_flag_by_word_subq(self) -> Subquery:
-        """
-        Whether any reading/kanji for a word is marked common (1/0).
-        """
-        return (
-            select(
-                Sense.word_id.label("word_id"),
-                func.greatest(
-                    func.coalesce(
-                        func.max(cast(Reading.is_common, Integer)).filter(Reading.word_id == Sense.word_id), 0
-                    ),
-                    func.coalesce(func.max(cast(Kanji.is_common, Integer)).filter(Kanji.word_id == Sense.word_id), 0),
-                ).label("any_common"),
-            )
-            .select_from(Sense)
-            .join(Reading, Reading.word_id == Sense.word_id, isouter=True)
-            .join(Kanji, Kanji.word_id == Sense.word_id, isouter=True)
-            .group_by(Sense.word_id)
-        ).subquery()
+        return select(per_word.c.word_id, final_score.label("score")).order_by(final_score.desc(), per_word.c.word_id)
 
-    def _build_english_gloss_fulltext_ranking_query(self) -> Select:
+    def _build_english_gloss_fulltext_ranking_query(self, q_raw: ColumnElement[str] | None = None) -> Select:
         """
-        Rank by Postgres full-text match on glosses (plainto_tsquery),
-        factoring in exact whole-word hits and 'common' flag.
+        Rank by Postgres full-text match on the stored gloss tsvector (plainto_tsquery),
+        factoring in exact whole-word hits and the word's precomputed 'common' flag.
+        `q_raw` defaults to the `q_raw` bind parameter; batch search passes a column instead.
         """
         cfg = cast(literal("english"), REGCONFIG)
-        q_raw = bindparam("q_raw")
+        if q_raw is None:
+            q_raw = bindparam("q_raw", type_=String)
 
-        gloss_vector = func.to_tsvector(cfg, func.coalesce(Gloss.text, literal("", String())))
+        gloss_vector = Gloss.text_tsv
         fts_query = func.plainto_tsquery(cfg, q_raw)
 
         rank = func.ts_rank_cd(gloss_vector, fts_query, literal(1 | 16 | 32))
@@ -230,70 +307,378 @@ class WordRepository:
             .group_by(Sense.word_id)
         ).subquery()
 
-        any_common = self._any_common_flag_by_word_subq()
-
         final = (
-            literal(self.weights.gloss_weight) * per_word_scores.c.rank_max
-            + literal(self.weights.exact_word_weight) * cast(per_word_scores.c.exact_any, Integer)
-            + literal(self.weights.common_weight) * cast(func.coalesce(any_common.c.any_common, 0), Integer)
+            weight_param("gloss_weight") * per_word_scores.c.rank_max
+            + weight_param("exact_word_weight") * cast(per_word_scores.c.exact_any, Integer)
+            + weight_param("common_weight") * cast(Word.is_common, Integer)
         )
 
         return (
             select(per_word_scores.c.word_id, final.label("score"))
-            .join(any_common, any_common.c.word_id == per_word_scores.c.word_id, isouter=True)
-            .order_by(final.desc())
+            .join(Word, Word.id == per_word_scores.c.word_id)
+            .order_by(final.desc(), per_word_scores.c.word_id)
+        )
+
+    def _build_romaji_ranking_query(
+        self,
+        q_raw: ColumnElement[str] | None = None,
+        q_romaji: ColumnElement[str] | None = None,
+    ) -> Select:
+        """
+        Rank a Latin query that also reads as romaji: gloss full-text scores plus scaled
+        prefix scores on the precomputed `readings.romaji` column, summed per word.
+        `q_romaji` defaults to the `q_romaji` bind parameter; batch search passes a column instead.
+        """
+        if q_romaji is None:
+            q_romaji = bindparam("q_romaji", type_=String)
+        romaji_branch = self._score_prefix_branch_for(
+            Reading,
+            q=q_romaji,
+            key=Reading.romaji,
+            base_weight=weight_param("reading_weight"),
+            exact_weight=weight_param("exact_reading_weight"),
         )
+        romaji = self._aggregate_prefix_branches(romaji_branch).order_by(None).subquery()
+        english = self._build_english_gloss_fulltext_ranking_query(q_raw).order_by(None).subquery()
 
-    async def rank_word_ids_for_query(self, query: str, limit: int = DEFAULT_LIMIT) -> Sequence[RowMapping]:
+        all_hits = union_all(
+            select(romaji.c.word_id, (romaji.c.score * weight_param("romaji_weight")).label("score")),
+            select(english.c.word_id, english.c.score),
+        ).subquery()
+
+        final_score = func.sum(all_hits.c.score)
+        return (
+            select(all_hits.c.word_id, final_score.label("score"))
+            .group_by(all_hits.c.word_id)
+            .order_by(final_score.desc(), all_hits.c.word_id)
+        )
+
+    def _build_ranking_query(self, kind: str, *columns: ColumnElement[str]) -> Select:
+        """Ranking query of a `_route` kind; `columns` replace its default query bind parameters."""
+        builders: dict[str, Callable[..., Select]] = {
+            JAPANESE_KIND: self._build_japanese_prefix_ranking_query,
+            ROMAJI_KIND: self._build_romaji_ranking_query,
+            ENGLISH_KIND: self._build_english_gloss_fulltext_ranking_query,
+        }
+        return builders[kind](*columns)
+
+    @staticmethod
+    @lru_cache(maxsize=ROUTE_CACHE_SIZE)
+    def _route(query: str) -> tuple[str, dict[str, str]]:
+        """
+        Pick the ranking kind of a query in-process, along with its query bind parameters.
+        Results are cached and shared between callers, so the parameters must not be mutated.
+        """
         query_norm = nfkc(query)
         if is_japanese_text(query_norm):
-            stmt = self._build_japanese_prefix_ranking_query().limit(limit)
-            params = {"q_norm": query_norm}
-        else:
-            stmt = self._build_english_gloss_fulltext_ranking_query().limit(limit)
-            params = {"q_raw": query}
-        result = await self.session.execute(stmt, params)
-        return result.mappings().all()
+            return JAPANESE_KIND, {"q_norm": search_key(query_norm)}
+        romaji_key = romaji_search_key(query_norm)
+        if romaji_key is not None:
+            return ROMAJI_KIND, {"q_raw": query, "q_romaji": romaji_key}
+        return ENGLISH_KIND, {"q_raw": query}
+
+    @staticmethod
+    def _query_class(kind: str, params: dict[str, str]) -> str:
+        if kind == JAPANESE_KIND and len(params["q_norm"]) == 1:
+            return SINGLE_CHAR_QUERY_CLASS
+        return kind
+
+    @classmethod
+    def query_class(cls, query: str) -> str:
+        """Metrics label of a query: its ranking kind, with single-character Japanese queries set apart."""
+        return cls._query_class(*cls._route(query))
+
+    @classmethod
+    def ranking_key(cls, query: str) -> tuple[str, ...]:
+        """What a query is ranked on (its kind and query bind parameters): queries with equal keys get equal results."""
+        kind, params = cls._route(query)
+        return (kind, *params.values())
+
+    @staticmethod
+    def _ranked_page(stmt: Select, *, paged: bool) -> Select:
+        """
+        Limit a ranking query to one page in (score desc, word_id) order, starting after the
+        (`after_score`, `after_word_id`) cursor when `paged`. The keyset condition stands in for
+        an OFFSET, so skipped rows are never sorted past or returned.
+        """
+        limit = bindparam("limit", type_=Integer)
+        if not paged:
+            return stmt.limit(limit)
 
-    async def get_word_details_by_ids(
+        ranked = stmt.order_by(None).subquery()
+        after_score = bindparam("after_score", type_=Float)
+        return (
+            select(ranked.c.word_id, ranked.c.score)
+            .where(
+                or_(
+                    ranked.c.score < after_score,
+                    and_(ranked.c.score == after_score, ranked.c.word_id > bindparam("after_word_id", type_=Integer)),
+                )
+            )
+            .order_by(ranked.c.score.desc(), ranked.c.word_id)
+            .limit(limit)
+        )
+
+    def _page_params(self, limit: int, after: SearchCursor | None) -> dict[str, Any]:
+        params: dict[str, Any] = {"limit": limit, **self.weights.params()}
+        if after is not None:
+            params |= {"after_score": after.score, "after_word_id": after.word_id}
+        return params
+
+    @staticmethod
+    def _word_card_columns(max_glosses_per_word: int) -> list[ColumnElement[list[str]]]:
+        """Readings, kanji and first glosses of a word, read from its precomputed card."""
+        return [
+            WordCard.readings.label("readings"),
+            WordCard.kanjis.label("kanji"),
+            WordCard.glosses[1:max_glosses_per_word].label("glosses"),
+        ]
+
+    @staticmethod
+    def _with_details(
+        ranked_rows: Sequence[dict[str, int | float]], details_by_id: dict[int, WordDetails]
+    ) -> list[RankedWordDetails]:
+        """
+        Ranked rows joined to their words' details. Like the SQL join to the cards, words without a card
+        are dropped: the prefix index may still rank words deleted by a reseed since it was loaded.
+        """
+        return [
+            RankedWordDetails(word_id=row["word_id"], score=row["score"], **details)
+            for row in ranked_rows
+            if (details := details_by_id.get(int(row["word_id"]))) is not None
+        ]
+
+    @staticmethod
+    def _ranked_word_details(row: Row) -> RankedWordDetails:
+        return RankedWordDetails(
+            word_id=row.word_id,
+            score=float(row.score),
+            readings=row.readings,
+            kanji=row.kanji,
+            glosses=row.glosses,
+        )
+
+    def _build_words_set_query(self, kind: str, arity: int, max_glosses_per_word: int) -> Select:
+        """
+        Ranking query for a whole set of queries, bound as `arity` parallel arrays `q0`, `q1`...:
+        they are unnested with their ordinal and each one is ranked in a LATERAL subquery.
+        """
+        names = [f"q{position}" for position in range(arity)]
+        queries = (
+            func.unnest(*(bindparam(name, type_=ARRAY(String)) for name in names))
+            .table_valued(*names, with_ordinality="idx")
+            .render_derived(BATCH_QUERIES_ALIAS, with_types=False)
+        )
+        # Bare textual references, so nested ranking subqueries refer to the outer row instead of re-adding it
+        columns = [literal_column(f"{BATCH_QUERIES_ALIAS}.{name}", String) for name in names]
+        ranked = self._build_ranking_query(kind, *columns).limit(bindparam("limit", type_=Integer)).lateral("ranked")
+
+        return (
+            select(
+                queries.c.idx,
+                ranked.c.word_id,
+                ranked.c.score,
+                *self._word_card_columns(max_glosses_per_word),
+            )
+            .select_from(queries)
+            .join(ranked, true())
+            .join(WordCard, WordCard.word_id == ranked.c.word_id)
+            .order_by(queries.c.idx, ranked.c.score.desc(), ranked.c.word_id)
+        )
+
+    async def _search_words_set(
+        self,
+        kind: str,
+        query_keys: list[tuple[str, ...]],
+        limit: int,
+        max_glosses_per_word: int,
+    ) -> list[list[RankedWordDetails]]:
+        """
+        Run one ranking query for a whole set of queries of the same kind, each limited to `limit` words.
+        Each key holds one value per query argument of the kind's ranking query builder.
+        """
+        arity = len(query_keys[0])
+        stmt = self._statement(
+            ("set", kind, arity, max_glosses_per_word),
+            lambda: self._build_words_set_query(kind, arity, max_glosses_per_word),
+        )
+        params = {f"q{position}": [key[position] for key in query_keys] for position in range(arity)}
+        results: list[list[RankedWordDetails]] = [[] for _ in query_keys]
+        with SEARCH_STAGE_SECONDS.time(RANK_AND_FETCH_STAGE, BATCH_QUERY_CLASS):
+            result = await self._execute(stmt, params | self._page_params(limit, None))
+            for row in result:
+                results[row.idx - 1].append(self._ranked_word_details(row))
+        return results
+
+    def _group_batch_queries(self, queries: Sequence[str]) -> dict[str, dict[tuple[str, ...], list[int]]]:
+        """Group queries by ranking kind, as ranking keys -> input positions."""
+        groups: dict[str, dict[tuple[str, ...], list[int]]] = {}
+        for position, query in enumerate(queries):
+            kind, params = self._route(query)
+            groups.setdefault(kind, {}).setdefault(tuple(params.values()), []).append(position)
+        return groups
+
+    async def search_words_batch(
         self,
-        word_ids: Sequence[int],
+        queries: Sequence[str],
+        limit: int = DEFAULT_LIMIT,
         max_glosses_per_word: int = 3,
-    ) -> dict[int, WordDetails]:
-        if not word_ids:
-            return {}
+    ) -> list[list[RankedWordDetails]]:
+        """
+        Ranked words with their details for many queries at once, returned in input order.
+        Duplicates are ranked once; Japanese, romaji and English queries each cost a single statement.
+        """
+        groups = self._group_batch_queries(queries)
+        results: list[list[RankedWordDetails]] = [[] for _ in queries]
+
+        japanese = groups.pop(JAPANESE_KIND, {})
+        if japanese and self.prefix_index is not None:
+            with SEARCH_STAGE_SECONDS.time(RANK_STAGE, BATCH_QUERY_CLASS):
+                ranked_by_key = {key: self.prefix_index.rank(key[0], self.weights, limit) for key in japanese}
+            # One hydration query for the words of every Japanese query
+            with SEARCH_STAGE_SECONDS.time(HYDRATE_STAGE, BATCH_QUERY_CLASS):
+                details_by_id = await self._fetch_word_details(
+                    [row["word_id"] for ranked_rows in ranked_by_key.values() for row in ranked_rows],
+                    max_glosses_per_word,
+                )
+            for key, ranked_rows in ranked_by_key.items():
+                words = self._with_details(ranked_rows, details_by_id)
+                for position in japanese[key]:
+                    results[position] = words
+        elif japanese:
+            groups[JAPANESE_KIND] = japanese
+
+        for kind, positions_by_key in groups.items():
+            keys = list(positions_by_key)
+            for key, words in zip(
+                keys,
+                await self._search_words_set(kind, keys, limit, max_glosses_per_word),
+                strict=True,
+            ):
+                for position in positions_by_key[key]:
+                    results[position] = words
+
+        return results
+
+    def _build_word_cards_query(self, kind: str, *, paged: bool) -> Select:
+        ranked = self._ranked_page(self._build_ranking_query(kind), paged=paged).subquery()
+        return (
+            select(ranked.c.word_id, ranked.c.score, WordCard.payload)
+            .join(WordCard, WordCard.word_id == ranked.c.word_id)
+            .order_by(ranked.c.score.desc(), ranked.c.word_id)
+        )
 
-        readings_rs = await self.session.execute(
-            select(Reading.word_id, func.array_agg(func.distinct(Reading.text)).label("readings"))
-            .where(Reading.word_id.in_(word_ids))
-            .group_by(Reading.word_id)
+    async def search_word_cards(
+        self, query: str, limit: int = DEFAULT_LIMIT, after: SearchCursor | None = None
+    ) -> list[tuple[int, float, str]]:
+        """
+        Ranked (word_id, score, payload) triples, where payload is the word card's pre-serialized JSON object,
+        for callers that write the response body without going through Python dicts.
+        """
+        kind, params = self._route(query)
+        query_class = self._query_class(kind, params)
+        if kind == JAPANESE_KIND and self.prefix_index is not None:
+            with SEARCH_STAGE_SECONDS.time(RANK_STAGE, query_class):
+                ranked_rows = self.prefix_index.rank(params["q_norm"], self.weights, limit, after)
+            if not ranked_rows:
+                return []
+            stmt = self._statement(
+                ("payloads",),
+                lambda: select(WordCard.word_id, WordCard.payload).where(
+                    WordCard.word_id == any_(bindparam("word_ids", type_=ARRAY(Integer)))
+                ),
+            )
+            with SEARCH_STAGE_SECONDS.time(HYDRATE_STAGE, query_class):
+                result = await self._execute(stmt, {"word_ids": [row["word_id"] for row in ranked_rows]}, query)
+                payload_by_id = dict(result.tuples().all())
+            # Words deleted by a reseed since the index was loaded have no card anymore, like in `_with_details`
+            return [
+                (int(row["word_id"]), float(row["score"]), payload)
+                for row in ranked_rows
+                if (payload := payload_by_id.get(int(row["word_id"]))) is not None
+            ]
+
+        stmt = self._statement(
+            ("cards", kind, after is not None),
+            lambda: self._build_word_cards_query(kind, paged=after is not None),
+        )
+        with SEARCH_STAGE_SECONDS.time(RANK_AND_FETCH_STAGE, query_class):
+            result = await self._execute(stmt, params | self._page_params(limit, after), query)
+            return [(word_id, float(score), payload) for word_id, score, payload in result]
+
+    @staticmethod
+    def _build_suggestions_query() -> Select:
+        prefixes = bindparam("prefixes", type_=ARRAY(String))
+        suggested = (
+            func.unnest(WordSuggestion.word_ids)
+            .table_valued("word_id", with_ordinality="idx")
+            .render_derived("suggested", with_types=False)
+        )
+        position = func.array_position(prefixes, WordSuggestion.prefix)
+        # A word ranked under several prefixes (今日: きょう and こんにち) keeps only its best rank
+        best = (
+            select(suggested.c.word_id, suggested.c.idx, position.label("position"))
+            .select_from(WordSuggestion)
+            .join(suggested, true())
+            .where(WordSuggestion.prefix == any_(prefixes))
+            .distinct(suggested.c.word_id)
+            .order_by(suggested.c.word_id, suggested.c.idx, position)
+            .subquery("best")
+        )
+        return (
+            select(WordCard.payload)
+            .join(best, WordCard.word_id == best.c.word_id)
+            # Interleave the rankings of several prefixes, best words first
+            .order_by(best.c.idx, best.c.position)
+            .limit(bindparam("limit", type_=Integer))
         )
-        readings_by_id = {row.word_id: row.readings for row in readings_rs}
 
-        kanji_rs = await self.session.execute(
-            select(Kanji.word_id, func.array_agg(func.distinct(Kanji.text)).label("kanji"))
-            .where(Kanji.word_id.in_(word_ids))
-            .group_by(Kanji.word_id)
+    async def suggest_word_cards(self, query: str, limit: int) -> list[str]:
+        """
+        Word card payloads precomputed for the query's search key, in ranking order: primary-key
+        reads on `word_suggestions` joined to the cards. Romaji queries are looked up by their kana,
+        under every kana syllable an unfinished trailing one may become ("tab" -> たば, たべ...).
+        """
+        query_norm = nfkc(query)
+        if is_japanese_text(query_norm):
+            keys, query_class = [search_key(query_norm)], JAPANESE_KIND
+        elif kana_prefixes := romaji_kana_prefixes(query_norm):
+            keys, query_class = [], ROMAJI_KIND
+            # Sorted, a key is followed by its extensions, whose words it already ranks among its own
+            for key in sorted({search_key(kana) for kana in kana_prefixes}):
+                if not keys or not key.startswith(keys[-1]):
+                    keys.append(key)
+        else:
+            return []
+
+        stmt = self._statement(("suggestions",), self._build_suggestions_query)
+        with SEARCH_STAGE_SECONDS.time(SUGGEST_STAGE, query_class):
+            result = await self._execute(stmt, {"prefixes": keys, "limit": limit}, query)
+            return list(result.scalars())
+
+    async def prewarm(self) -> None:
+        """Run the hot search statements once, so the connection behind this session has them prepared."""
+        await self.get_dataset_version()
+        for query in PREWARM_QUERIES:
+            await self.search_word_cards(query, self.DEFAULT_LIMIT + 1)
+            await self.suggest_word_cards(query, WORD_SUGGESTION_LIMIT)
+
+    async def get_dataset_version(self) -> int:
+        version = await self.session.scalar(
+            select(DatasetVersion.version).where(DatasetVersion.id == DATASET_VERSION_ROW_ID)
         )
-        kanji_by_id = {row.word_id: row.kanji for row in kanji_rs}
+        return version or 0
+
+    async def _fetch_word_details(self, word_ids: Sequence[int], max_glosses_per_word: int) -> dict[int, WordDetails]:
+        """Details of the words of `word_ids` that have a card; unknown ids are left out."""
+        if not word_ids:
+            return {}
 
-        gloss_rs = await self.session.execute(
-            select(Sense.word_id, Gloss.text)
-            .join(Gloss, Gloss.sense_id == Sense.id)
-            .where(Sense.word_id.in_(word_ids))
-            .limit(len(word_ids) * max_glosses_per_word * 2)
+        stmt = self._statement(
+            ("details_by_ids", max_glosses_per_word),
+            lambda: select(WordCard.word_id, *self._word_card_columns(max_glosses_per_word)).where(
+                WordCard.word_id == any_(bindparam("word_ids", type_=ARRAY(Integer)))
+            ),
         )
-        glosses_by_id: dict[int, list[str]] = {}
-        for word_id, text in gloss_rs:
-            bucket = glosses_by_id.setdefault(word_id, [])
-            if len(bucket) < max_glosses_per_word:
-                bucket.append(text)
-
-        out: dict[int, WordDetails] = {}
-        for wid in word_ids:
-            out[wid] = WordDetails(
-                readings=readings_by_id.get(wid, []),
-                kanji=kanji_by_id.get(wid, []),
-                glosses=glosses_by_id.get(wid, []),
-            )
-        return out
+        result = await self._execute(stmt, {"word_ids": list(word_ids)})
+        return {row.word_id: WordDetails(readings=row.readings, kanji=row.kanji, glosses=row.glosses) for row in result}